@@ -0,0 +1,53 @@
+import argparse
+import os
+from pathlib import Path
+
+from src.batch import process_pdfs
+from src.pipeline.ocr import get_ocr_profile
+
+INPUT_SUFFIXES = (".pdf", ".png", ".jpg", ".jpeg", ".webp", ".tif", ".tiff")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract many brochures on one shared worker pool")
+    parser.add_argument("inputs", nargs="+", help="PDF/image files or directories containing them")
+    parser.add_argument("--output-dir", default="data/output", help="Where *_extracted.txt files go")
+    parser.add_argument("--workers", type=int, help="Worker processes (defaults to BATCH_WORKERS or CPU count)")
+    parser.add_argument("--raster-budget-mb", type=int, help="Raster memory budget across workers")
+    parser.add_argument("--ocr-profile", help="OCR profile: fast, balanced or accurate")
+    args = parser.parse_args()
+
+    paths = []
+    for item in args.inputs:
+        item = Path(item)
+        if item.is_dir():
+            paths.extend(sorted(p for p in item.iterdir() if p.suffix.lower() in INPUT_SUFFIXES))
+        else:
+            paths.append(item)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    ocr_profile, _ = get_ocr_profile(args.ocr_profile)
+    failed = 0
+    for path, result in process_pdfs(
+        [str(p) for p in paths],
+        ocr_profile=ocr_profile,
+        workers=args.workers,
+        raster_budget_mb=args.raster_budget_mb,
+    ):
+        if result["error"]:
+            failed += 1
+            print(f"Failed {path}: {result['error']}")
+            continue
+        output_path = Path(args.output_dir) / f"{Path(path).stem}_extracted.txt"
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(f"OCR profile: {ocr_profile}\n")
+            for i, chunk in enumerate(result["chunks"]):
+                f.write(f"\n--- Chunk {i+1} ---\n\n")
+                f.write(chunk)
+        print(f"Wrote {output_path} ({result['pdf_type']}, {result['elapsed']:.1f}s)")
+
+    print(f"Done: {len(paths) - failed} extracted, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import difflib
+import time
+from pathlib import Path
+
+import fitz
+
+from src.main import RENDER_DPI, MIN_TEXT_CHARS
+from src.pipeline.cleaner import clean_text
+from src.pipeline.engines import OCR_ENGINES
+from src.pipeline.ocr import OCR_PROFILES, DEFAULT_OCR_PROFILE, ocr_pixmap_lines
+
+
+def _similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, " ".join(a.split()), " ".join(b.split())).ratio()
+
+
+def _render_pages(pdf_path: Path, dpi: int):
+    doc = fitz.open(pdf_path)
+    zoom = dpi / 72
+    for page_index, page in enumerate(doc):
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        yield page_index + 1, clean_text(page.get_text("text")), pix
+    doc.close()
+
+
+def compare(pdf_paths: list[Path], engines: list[str], profile: str, dpi: int):
+    """Run every engine on every rendered page, bypassing the OCR cache.
+
+    Pages with a usable text layer double as ground truth; elsewhere engines are
+    compared against the first engine in the list.
+    """
+    stats = {
+        name: {"pages": 0, "seconds": 0.0, "chars": 0, "conf": [], "text_layer": [], "agreement": []}
+        for name in engines
+    }
+
+    for pdf_path in pdf_paths:
+        print(f"{pdf_path}")
+        for page_number, layer_text, pix in _render_pages(pdf_path, dpi):
+            texts = {}
+            for name in engines:
+                start = time.perf_counter()
+                lines = ocr_pixmap_lines(
+                    pix, source_type="rendered", profile=profile, engine=name, use_cache=False
+                )
+                elapsed = time.perf_counter() - start
+
+                text = "\n".join(line["text"] for line in lines)
+                texts[name] = text
+                s = stats[name]
+                s["pages"] += 1
+                s["seconds"] += elapsed
+                s["chars"] += len(text)
+                s["conf"].extend(line["confidence"] for line in lines)
+                if len(layer_text) >= MIN_TEXT_CHARS:
+                    s["text_layer"].append(_similarity(text, layer_text))
+                if name != engines[0]:
+                    s["agreement"].append(_similarity(text, texts[engines[0]]))
+                print(f"  page {page_number} {name}: {elapsed:.2f}s {len(text)} chars")
+
+    def mean(values):
+        return sum(values) / len(values) if values else float("nan")
+
+    print(f"\nprofile={profile} dpi={dpi}")
+    print(f"{'engine':<12}{'pages':>7}{'s/page':>9}{'chars':>9}{'conf':>7}{'vs layer':>10}{'vs ' + engines[0]:>12}")
+    for name in engines:
+        s = stats[name]
+        print(
+            f"{name:<12}{s['pages']:>7}{s['seconds'] / max(1, s['pages']):>9.2f}{s['chars']:>9}"
+            f"{mean(s['conf']):>7.2f}{mean(s['text_layer']):>10.2f}{mean(s['agreement']):>12.2f}"
+        )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OCR engines on a PDF corpus")
+    parser.add_argument("paths", nargs="*", default=["data/input"], help="PDF files or directories")
+    parser.add_argument("--engines", default=",".join(OCR_ENGINES), help="Comma-separated engine names")
+    parser.add_argument("--profile", choices=sorted(OCR_PROFILES), default=DEFAULT_OCR_PROFILE)
+    parser.add_argument("--dpi", type=int, default=RENDER_DPI)
+    args = parser.parse_args()
+
+    pdf_paths = []
+    for p in map(Path, args.paths):
+        pdf_paths.extend(sorted(p.glob("*.pdf")) if p.is_dir() else [p])
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    compare(pdf_paths, engines, args.profile, args.dpi)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import json
+import math
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.mock_gemini_server import add_mock_arguments, mock_config_from_args, start_mock_server
+from src.config import GEMINI_REQUESTS_PER_MINUTE, GEMINI_TIMEOUT, GEMINI_TOKENS_PER_MINUTE
+from src.llm.gemini import AsyncGeminiClient
+from src.llm.parser import parse_with_llm_async
+
+# Drives the LLM stage the way process_events.py --llm-concurrency does (one
+# shared AsyncGeminiClient, all documents gathered at once) against the local
+# Gemini mock, and reports throughput, retries and tail latency per level.
+
+SYNTHETIC_LINE = "1st Prize Rs. 5000 Trophy | Round 3 10:15 am | Entry fee Rs. 500 | Venue: Community Hall, Pune\n"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _load_contents(inputs: list[str], count: int, content_chars: int) -> list[str]:
+    if inputs:
+        texts = [Path(p).read_text(encoding="utf-8") for p in inputs]
+    else:
+        texts = [(SYNTHETIC_LINE * (content_chars // len(SYNTHETIC_LINE) + 1))[:content_chars]]
+    return [texts[i % len(texts)] for i in range(count)]
+
+
+async def _run_level(contents: list[str], concurrency: int, base_url: str, args, output_dir: Path) -> dict:
+    client = AsyncGeminiClient(
+        api_key=args.api_key,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute,
+        max_concurrency=concurrency,
+        timeout=args.timeout,
+        base_url=base_url,
+    )
+    latencies = []
+    errors = {}
+
+    async def run(i: int, content: str):
+        # End-to-end per document: includes waiting for a concurrency slot,
+        # so it grows with --requests; the service columns do not.
+        started = time.perf_counter()
+        try:
+            await parse_with_llm_async(content, output_path=output_dir / f"{i}.json", client=client)
+            latencies.append(time.perf_counter() - started)
+        except Exception as e:
+            name = type(e).__name__
+            errors[name] = errors.get(name, 0) + 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(run(i, content) for i, content in enumerate(contents)))
+    finally:
+        client.close()
+    wall = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "documents": len(contents),
+        "ok": len(latencies),
+        "failed": sum(errors.values()),
+        "errors": errors,
+        "wall_seconds": wall,
+        "docs_per_minute": len(latencies) / wall * 60 if wall else 0.0,
+        "http_requests": client.stats["requests"],
+        "retries": client.stats["retries"],
+        "rate_limited": client.stats["rate_limited"],
+        "service_p50": _percentile(client.call_seconds, 50),
+        "service_p95": _percentile(client.call_seconds, 95),
+        "service_p99": _percentile(client.call_seconds, 99),
+        "service_max": max(client.call_seconds, default=float("nan")),
+        "e2e_p50": _percentile(latencies, 50),
+        "e2e_p95": _percentile(latencies, 95),
+    }
+
+
+def _print_report(results: list[dict]):
+    header = (
+        f"{'conc':>5} {'ok':>5} {'fail':>5} {'docs/min':>9} {'http':>6} {'retry':>6} {'429':>5} "
+        f"{'svc p50':>7} {'svc p95':>7} {'svc p99':>7} {'svc max':>7} {'e2e p50':>7} {'e2e p95':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['concurrency']:>5} {r['ok']:>5} {r['failed']:>5} {r['docs_per_minute']:>9.1f} "
+            f"{r['http_requests']:>6} {r['retries']:>6} {r['rate_limited']:>5} "
+            f"{r['service_p50']:>7.2f} {r['service_p95']:>7.2f} {r['service_p99']:>7.2f} {r['service_max']:>7.2f} "
+            f"{r['e2e_p50']:>7.2f} {r['e2e_p95']:>7.2f}"
+        )
+        if r["errors"]:
+            print(f"      errors: {r['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the LLM stage against a local Gemini mock")
+    parser.add_argument("--concurrency", default="1,4,8,16", help="Comma-separated max in-flight request levels")
+    parser.add_argument("--requests", type=int, default=40, help="Documents sent per concurrency level")
+    parser.add_argument("--inputs", nargs="*", default=[], help="Extracted text files to send (cycled); synthetic text otherwise")
+    parser.add_argument("--content-chars", type=int, default=12000, help="Size of the synthetic document")
+    parser.add_argument(
+        "--base-url",
+        help="Use an already running mock (e.g. http://127.0.0.1:3920/v1beta/models) instead of an in-process one",
+    )
+    parser.add_argument("--api-key", default="mock", help="Key sent to the mock")
+    parser.add_argument("--requests-per-minute", type=int, default=GEMINI_REQUESTS_PER_MINUTE, help="Client-side RPM limit")
+    parser.add_argument("--tokens-per-minute", type=int, default=GEMINI_TOKENS_PER_MINUTE, help="Client-side TPM limit")
+    parser.add_argument("--timeout", type=float, default=GEMINI_TIMEOUT, help="Per-document deadline in seconds")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    contents = _load_contents(args.inputs, args.requests, args.content_chars)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for level in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            server = None
+            base_url = args.base_url
+            if not base_url:
+                # A fresh mock per level so its RPM window and counters start empty.
+                server, _, base_url = start_mock_server(mock_config_from_args(args))
+            try:
+                output_dir = Path(tmp) / f"c{level}"
+                output_dir.mkdir()
+                print(f"Running {len(contents)} documents at concurrency {level} against {base_url}")
+                results.append(asyncio.run(_run_level(contents, level, base_url, args, output_dir)))
+            finally:
+                if server:
+                    server.shutdown()
+                    server.server_close()
+
+    print()
+    _print_report(results)
+    print("\nsvc: seconds each HTTP call held a concurrency slot; e2e: per document, including slot waits and retries")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nWrote results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Local stand-in for Gemini's generateContent endpoint, used to load-test the
+# LLM stage (parse_with_llm, process_events.py, scripts/llm_load_test.py)
+# without spending real quota. Point GEMINI_BASE_URL at
+# http://<host>:<port>/v1beta/models.
+
+CANNED_ANALYSIS = {
+    "tournamentName": "Stub Open Rapid Rating Tournament",
+    "organizer": "Stub Chess Association",
+    "organizingCommittee": None,
+    "venue": {"location": "Community Hall", "city": "Pune", "state": "Maharashtra"},
+    "dates": {
+        "registrationStart": None,
+        "registrationEnd": "2025-10-01",
+        "tournamentStart": "2025-10-04",
+        "tournamentEnd": "2025-10-05",
+    },
+    "schedule": {"rounds": 9, "roundsSchedule": None, "activities": None},
+}
+LATENCY_MODELS = ("fixed", "uniform", "lognormal")
+
+
+class MockConfig:
+    def __init__(
+        self,
+        latency: str = "lognormal",
+        latency_ms: float = 1500.0,
+        spread: float = 0.5,
+        rate_429: float = 0.0,
+        rate_5xx: float = 0.0,
+        retry_after: float = 1.0,
+        rpm: int = 0,
+        response: dict | None = None,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.spread = spread
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.rpm = rpm
+        self.response = response if response is not None else CANNED_ANALYSIS
+        self.random = random.Random(seed)
+
+
+class MockState:
+    """Latency sampling, fault injection, the optional RPM quota and counters."""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.counts = {"requests": 0, "ok": 0, "429": 0, "5xx": 0, "client_aborts": 0}
+
+    def delay_seconds(self) -> float:
+        cfg = self.config
+        with self.lock:
+            if cfg.latency == "fixed":
+                ms = cfg.latency_ms
+            elif cfg.latency == "uniform":
+                ms = cfg.random.uniform(cfg.latency_ms * (1 - cfg.spread), cfg.latency_ms * (1 + cfg.spread))
+            else:
+                # latency_ms is the median; spread is sigma of the underlying normal.
+                ms = cfg.latency_ms * cfg.random.lognormvariate(0, cfg.spread)
+        return max(0.0, ms) / 1000
+
+    def outcome(self) -> int:
+        """HTTP status for the next request: quota and injected errors first."""
+        cfg = self.config
+        now = time.monotonic()
+        with self.lock:
+            self.counts["requests"] += 1
+            if cfg.rpm:
+                while self.recent and now - self.recent[0] > 60:
+                    self.recent.popleft()
+                if len(self.recent) >= cfg.rpm:
+                    self.counts["429"] += 1
+                    return 429
+                self.recent.append(now)
+            roll = cfg.random.random()
+            if roll < cfg.rate_429:
+                self.counts["429"] += 1
+                return 429
+            if roll < cfg.rate_429 + cfg.rate_5xx:
+                self.counts["5xx"] += 1
+                return cfg.random.choice((500, 503))
+            self.counts["ok"] += 1
+            return 200
+
+    def count_abort(self):
+        with self.lock:
+            self.counts["client_aborts"] += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counts)
+
+
+def _generate_content_body(analysis: dict) -> dict:
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": json.dumps(analysis, ensure_ascii=False)}]},
+            "finishReason": "STOP",
+        }],
+    }
+
+
+def make_handler(state: MockState):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: dict, headers: dict | None = None):
+            body = json.dumps(payload).encode("utf-8")
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client hit its deadline and hung up while we were "thinking".
+                state.count_abort()
+                self.close_connection = True
+
+        def do_GET(self):
+            if urlparse(self.path).path == "/stats":
+                self._send(200, state.stats())
+            else:
+                self._send(404, {"error": {"code": 404, "message": "Not found"}})
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not urlparse(self.path).path.endswith(":generateContent"):
+                self._send(404, {"error": {"code": 404, "message": "Not found"}})
+                return
+
+            status = state.outcome()
+            time.sleep(state.delay_seconds())
+            if status == 200:
+                self._send(200, _generate_content_body(state.config.response))
+            elif status == 429:
+                self._send(
+                    429,
+                    {"error": {"code": 429, "message": "Resource has been exhausted", "status": "RESOURCE_EXHAUSTED"}},
+                    {"Retry-After": f"{state.config.retry_after:g}"},
+                )
+            else:
+                self._send(status, {"error": {"code": status, "message": "Injected server error"}})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_mock_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0):
+    """Serve the mock on a daemon thread; returns (server, state, base_url)."""
+    state = MockState(config)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}/v1beta/models"
+    return server, state, base_url
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", choices=LATENCY_MODELS, default="lognormal", help="Response latency distribution")
+    parser.add_argument("--latency-ms", type=float, default=1500.0, help="Fixed/mean (uniform) or median (lognormal) latency")
+    parser.add_argument(
+        "--latency-spread",
+        type=float,
+        default=0.5,
+        help="Uniform: +/- fraction of latency-ms; lognormal: sigma",
+    )
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Fraction of requests answered with 500/503")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--rpm", type=int, default=0, help="Emulated requests/min quota (0 = unlimited)")
+    parser.add_argument("--response", help="JSON file with the analysis returned for every request")
+    parser.add_argument("--seed", type=int, help="Random seed for latency and fault injection")
+
+
+def mock_config_from_args(args) -> MockConfig:
+    response = json.loads(Path(args.response).read_text(encoding="utf-8")) if args.response else None
+    return MockConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        spread=args.latency_spread,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after,
+        rpm=args.rpm,
+        response=response,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local mock of Gemini generateContent")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3920)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server, state, base_url = start_mock_server(mock_config_from_args(args), args.host, args.port)
+    print(f"[mock-gemini] Serving on {base_url} (set GEMINI_BASE_URL to this); stats at /stats")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print(f"[mock-gemini] {state.stats()}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
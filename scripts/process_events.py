@@ -1,4 +1,6 @@
 import argparse
+import asyncio
+import json
 import re
 from datetime import datetime
 from pathlib import Path
@@ -6,12 +8,18 @@ from urllib.parse import urlparse
 
 import requests
 
-from src.main import process_pdf
-from src.llm.parser import parse_with_llm
+from src.main import process_pdf_detailed
+from src.llm.gemini import AsyncGeminiClient
+from src.llm.parser import parse_with_llm, parse_with_llm_async
+from src.pipeline.ocr import OCR_PROFILES, DEFAULT_OCR_PROFILE
+from src.profiling import PROFILE_ENABLED
+from src.sink import ResultSink, PostSink, BatchHttpSink, FileSink
 
 
 DEFAULT_BASE_URL = "http://localhost:3000"
 DEFAULT_CUTOFF = datetime(2026, 1, 1)
+DEFAULT_SYNC_STATE = Path("data/events_sync.json")
+DEFAULT_PAGE_SIZE = 100
 
 
 def _log(msg: str):
@@ -85,18 +93,67 @@ def fetch_single_event(base_url: str, event_id: str):
     return event
 
 
+def iter_event_pages(base_url: str, updated_since: str | None = None, page_size: int = DEFAULT_PAGE_SIZE):
+    """Yield pages (lists) of events from the paginated /api/events feed.
+
+    Only events updated since `updated_since` are requested, and that value
+    stays fixed for the whole walk. `nextCursor` is opaque: the server encodes
+    the (updatedAt, eventId) key of the last row it returned and continues
+    after it, so events updated while we process a page (including our own
+    analysis uploads) reappear later instead of shifting unread rows past the
+    cursor. Pages are fetched lazily, so memory stays bounded by one page
+    however large the catalogue is.
+    """
+    url = f"{base_url.rstrip('/')}/api/events"
+    cursor = None
+    while True:
+        params = {"limit": page_size}
+        if updated_since:
+            params["updatedSince"] = updated_since
+        if cursor:
+            params["cursor"] = cursor
+        resp = requests.get(url, params=params, timeout=60)
+        resp.raise_for_status()
+        payload = resp.json()
+        if payload.get("success") is False:
+            raise RuntimeError(f"API returned error: {payload.get('error', 'Unknown error')}")
+        events = payload.get("data", [])
+        if not isinstance(events, list):
+            raise RuntimeError("Unexpected API payload: data is not a list")
+        yield events
+        cursor = payload.get("nextCursor")
+        if not cursor or not events:
+            return
+
+
+def _load_watermark(path: Path):
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f).get("updatedSince")
+    except (OSError, ValueError):
+        return None
+
+
+def _save_watermark(path: Path, value: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump({"updatedSince": value}, f)
+    tmp.replace(path)
+
+
+def _is_pending(event):
+    if not _has_brochure(event):
+        return False
+    start_date = _parse_date(event.get("startDate"))
+    if not start_date or start_date < DEFAULT_CUTOFF:
+        return False
+    return event.get("Analysis", None) is None
+
+
 def filter_events(events):
     _log("Filtering events with brochure + startDate >= 2026-01-01 + no Analysis...")
-    filtered = []
-    for event in events:
-        if not _has_brochure(event):
-            continue
-        start_date = _parse_date(event.get("startDate"))
-        if not start_date or start_date < DEFAULT_CUTOFF:
-            continue
-        if event.get("Analysis", None) is not None:
-            continue
-        filtered.append(event)
+    filtered = [event for event in events if _is_pending(event)]
     _log(f"Selected {len(filtered)} / {len(events)} events")
     return filtered
 
@@ -111,48 +168,294 @@ def _download_brochure(url: str, target: Path):
                     f.write(chunk)
 
 
-def _write_extracted(chunks: list[str], output_path: Path):
+def _write_extracted(chunks: list[str], output_path: Path, ocr_profile: str, degraded: list[dict]):
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as f:
+        f.write(f"OCR profile: {ocr_profile}\n")
+        for item in degraded:
+            f.write(f"Degraded page {item['page']} {item['stage']}: {item['action']} ({item['reason']})\n")
         for i, chunk in enumerate(chunks, start=1):
             f.write(f"\n--- Chunk {i} ---\n\n")
             f.write(chunk)
 
 
-def process_event(event, input_dir: Path, extracted_dir: Path, llm_dir: Path, base_url: str):
+def _event_paths(event, input_dir: Path, extracted_dir: Path, llm_dir: Path):
     key = _event_key(event)
-    event_id = event.get("event_id") or event.get("eventId") or event.get("id") or event.get("_id") or key
     brochure_url = event["brochure"].strip()
     brochure_ext = Path(urlparse(brochure_url).path).suffix or ".pdf"
-    pdf_path = input_dir / f"{key}{brochure_ext}"
-    extracted_path = extracted_dir / f"{key}_extracted.txt"
-    llm_output_path = llm_dir / key / "analysis.json"
+    return (
+        key,
+        brochure_url,
+        input_dir / f"{key}{brochure_ext}",
+        extracted_dir / f"{key}_extracted.txt",
+        llm_dir / key / "analysis.json",
+    )
 
-    _log(f"Processing event {key}")
+
+def _event_id(event, key: str):
+    return event.get("event_id") or event.get("eventId") or event.get("id") or event.get("_id") or key
+
+
+def _extract_event(brochure_url: str, pdf_path: Path, extracted_path: Path, ocr_profile: str, profile: bool = False):
     _download_brochure(brochure_url, pdf_path)
-    chunks = process_pdf(str(pdf_path))
-    _write_extracted(chunks, extracted_path)
-    content = "\n\n".join(chunks)
+    profile_path = extracted_path.with_suffix(".profile.txt") if profile else None
+    result = process_pdf_detailed(str(pdf_path), ocr_profile=ocr_profile, profile_path=profile_path)
+    chunks = result["chunks"]
+    _write_extracted(chunks, extracted_path, ocr_profile, result["degraded"])
+    return "\n\n".join(chunks)
+
+
+def process_event(
+    event,
+    input_dir: Path,
+    extracted_dir: Path,
+    llm_dir: Path,
+    sink: ResultSink,
+    ocr_profile: str,
+    profile: bool = False,
+):
+    key, brochure_url, pdf_path, extracted_path, llm_output_path = _event_paths(
+        event, input_dir, extracted_dir, llm_dir
+    )
+    event_id = _event_id(event, key)
+
+    _log(f"Processing event {key}")
+    content = _extract_event(brochure_url, pdf_path, extracted_path, ocr_profile, profile)
     analysis = parse_with_llm(content, output_path=llm_output_path)
-    response = requests.post(
-        f"{base_url.rstrip('/')}/api/analysis",
-        json={"eventId": event_id, "Analysis": analysis},
-        timeout=60,
+    sink.add(event_id, analysis)
+    _log(f"Saved LLM output to {llm_output_path}")
+
+
+async def process_event_async(
+    event,
+    input_dir: Path,
+    extracted_dir: Path,
+    llm_dir: Path,
+    sink: ResultSink,
+    ocr_profile: str,
+    client: AsyncGeminiClient,
+    extract_lock: asyncio.Lock,
+    profile: bool = False,
+):
+    """Like `process_event`, but overlaps this event's LLM call with other events."""
+    key, brochure_url, pdf_path, extracted_path, llm_output_path = _event_paths(
+        event, input_dir, extracted_dir, llm_dir
     )
-    response.raise_for_status()
+    event_id = _event_id(event, key)
+
+    # PDF extraction/OCR stays one-at-a-time; only the LLM stage runs concurrently.
+    async with extract_lock:
+        _log(f"Processing event {key}")
+        content = await asyncio.to_thread(
+            _extract_event, brochure_url, pdf_path, extracted_path, ocr_profile, profile
+        )
+    analysis = await parse_with_llm_async(content, output_path=llm_output_path, client=client)
+    await asyncio.to_thread(sink.add, event_id, analysis)
     _log(f"Saved LLM output to {llm_output_path}")
 
 
+async def _process_events_async(
+    selected, input_dir, extracted_dir, llm_dir, sink, ocr_profile, client: AsyncGeminiClient, profile: bool = False
+):
+    extract_lock = asyncio.Lock()
+
+    async def run(event):
+        try:
+            await process_event_async(
+                event,
+                input_dir,
+                extracted_dir,
+                llm_dir,
+                sink,
+                ocr_profile,
+                client,
+                extract_lock,
+                profile,
+            )
+            return True
+        except Exception as exc:
+            _log(f"Failed event {_event_key(event)}: {exc}")
+            return False
+
+    results = await asyncio.gather(*(run(event) for event in selected))
+    _log(f"LLM stats: {client.stats}")
+    return results.count(False)
+
+
+def _make_sink(args) -> ResultSink:
+    if args.sink == "batch":
+        return BatchHttpSink(args.base_url)
+    if args.sink == "file":
+        return FileSink(args.sink_path)
+    return PostSink(args.base_url)
+
+
+def _close_sink(sink: ResultSink) -> int:
+    """Flush and close the sink; returns how many analyses could not be delivered."""
+    try:
+        sink.close()
+        return 0
+    except Exception as exc:
+        unsent = sink.pending()
+        _log(f"Failed to upload {unsent} buffered results: {exc}")
+        return unsent
+
+
+def _make_client(args) -> AsyncGeminiClient | None:
+    """One async client per run (so rate limits hold across pages), or None for sequential runs."""
+    if args.llm_concurrency > 1:
+        return AsyncGeminiClient(max_concurrency=args.llm_concurrency)
+    return None
+
+
+async def _process_selected(
+    selected,
+    args,
+    sink: ResultSink,
+    client: AsyncGeminiClient | None,
+    input_dir: Path,
+    extracted_dir: Path,
+    llm_dir: Path,
+):
+    """Process events and return the number that failed."""
+    if client is not None:
+        return await _process_events_async(
+            selected,
+            input_dir,
+            extracted_dir,
+            llm_dir,
+            sink,
+            args.ocr_profile,
+            client,
+            args.profile,
+        )
+
+    failures = 0
+    for event in selected:
+        try:
+            await asyncio.to_thread(
+                process_event, event, input_dir, extracted_dir, llm_dir, sink, args.ocr_profile, args.profile
+            )
+        except Exception as exc:
+            failures += 1
+            _log(f"Failed event {_event_key(event)}: {exc}")
+    return failures
+
+
+async def _sync_events(
+    args,
+    sink: ResultSink,
+    client: AsyncGeminiClient | None,
+    input_dir: Path,
+    extracted_dir: Path,
+    llm_dir: Path,
+):
+    """Page through events updated since the stored watermark, processing as we go.
+
+    The watermark (max `updatedAt` seen) is saved after each fully successful
+    page, and only once the sink has flushed, so buffered analyses are
+    delivered before the feed moves past their events. After the first
+    processing or upload failure it stops advancing, so those events are
+    fetched again on the next run.
+
+    Returns:
+        (processed, failures)
+    """
+    state_path = Path(args.sync_state)
+    watermark = _load_watermark(state_path)
+    _log(f"Syncing events updated since {watermark or 'the beginning'}...")
+
+    seen = processed = failures = 0
+    advance = True
+    pages = iter_event_pages(args.base_url, watermark, args.page_size)
+    while (page := await asyncio.to_thread(next, pages, None)) is not None:
+        seen += len(page)
+        selected = [event for event in page if _is_pending(event)]
+        page_failures = 0
+        if selected:
+            page_failures = await _process_selected(
+                selected, args, sink, client, input_dir, extracted_dir, llm_dir
+            )
+        processed += len(selected) - page_failures
+        failures += page_failures
+
+        if page_failures:
+            advance = False
+        updated = [e["updatedAt"] for e in page if isinstance(e.get("updatedAt"), str)]
+        if advance and updated:
+            try:
+                await asyncio.to_thread(sink.flush)
+            except Exception as exc:
+                _log(f"Failed to upload buffered results, not advancing the watermark: {exc}")
+                advance = False
+                continue
+            watermark = max([watermark, *updated] if watermark else updated)
+            _save_watermark(state_path, watermark)
+
+    _log(f"Synced {seen} updated events; watermark={watermark}")
+    return processed, failures
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fetch events and process brochure PDFs")
     parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="API base URL")
     parser.add_argument("--event-id", help="Process a single event by ID")
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=1,
+        help="Max in-flight Gemini requests; values > 1 use the async LLM client",
+    )
+    parser.add_argument(
+        "--ocr-profile",
+        choices=sorted(OCR_PROFILES),
+        default=DEFAULT_OCR_PROFILE,
+        help="OCR speed/accuracy profile",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=PROFILE_ENABLED,
+        help="Write a per-stage CPU/memory profile next to each extracted text file (default from PDF_PROFILE)",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=("post", "batch", "file"),
+        default="post",
+        help="Result upload: one POST per event, gzipped batches, or a local file",
+    )
+    parser.add_argument(
+        "--sink-path",
+        default="data/llm/analyses.jsonl.gz",
+        help="Output file for --sink file",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Page through events updated since the stored watermark instead of /api/events/all",
+    )
+    parser.add_argument("--sync-state", default=str(DEFAULT_SYNC_STATE), help="Watermark file for --sync")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Events per page for --sync")
     args = parser.parse_args()
 
     input_dir = Path("data/input/events")
     extracted_dir = Path("data/output/events")
     llm_dir = Path("data/llm")
 
+    if args.sync:
+        sink = _make_sink(args)
+        client = _make_client(args)
+        try:
+            processed, failures = asyncio.run(
+                _sync_events(args, sink, client, input_dir, extracted_dir, llm_dir)
+            )
+        finally:
+            if client:
+                client.close()
+        unsent = _close_sink(sink)
+        _log(f"Done. processed={processed - unsent} failed={failures + unsent}")
+        return
+
     if args.event_id:
         selected = [fetch_single_event(args.base_url, args.event_id)]
     else:
@@ -166,14 +469,17 @@ def main():
             _log("No events matched filters")
             return
 
-    failures = 0
-    for event in selected:
-        try:
-            process_event(event, input_dir, extracted_dir, llm_dir, args.base_url)
-        except Exception as exc:
-            failures += 1
-            _log(f"Failed event {_event_key(event)}: {exc}")
-
+    sink = _make_sink(args)
+    client = _make_client(args)
+    try:
+        failures = asyncio.run(
+            _process_selected(selected, args, sink, client, input_dir, extracted_dir, llm_dir)
+        )
+    finally:
+        if client:
+            client.close()
+
+    failures += _close_sink(sink)
     _log(f"Done. processed={len(selected) - failures} failed={failures}")
 
 
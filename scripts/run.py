@@ -1,19 +1,33 @@
 import os
 
-from src.main import process_pdf
+from src.main import process_pdf_detailed
+from src.pipeline.ocr import get_ocr_profile
+from src.profiling import PROFILE_ENABLED
 
-file_path = "data/input/sample3.pdf"
-chunks = process_pdf(file_path)
 
-os.makedirs("data/output", exist_ok=True)
-output_path = file_path.replace("data/input", "data/output").replace(".pdf", "_extracted.txt")
-with open(output_path, "w", encoding="utf-8") as f:
+def main():
+    file_path = "data/input/sample3.pdf"
+    os.makedirs("data/output", exist_ok=True)
+    output_path = file_path.replace("data/input", "data/output").replace(".pdf", "_extracted.txt")
+
+    # PDF_PROFILE=true writes a per-stage CPU/memory report next to the output.
+    profile_path = output_path.replace(".txt", ".profile.txt") if PROFILE_ENABLED else None
+    ocr_profile, _ = get_ocr_profile()
+    chunks = process_pdf_detailed(file_path, ocr_profile=ocr_profile, profile_path=profile_path)["chunks"]
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(f"OCR profile: {ocr_profile}\n")
+        for i, chunk in enumerate(chunks):
+            f.write(f"\n--- Chunk {i+1} ---\n\n")
+            f.write(chunk)
+
+    print(f"\nWrote full extracted text to: {output_path}")
+
     for i, chunk in enumerate(chunks):
-        f.write(f"\n--- Chunk {i+1} ---\n\n")
-        f.write(chunk)
+        print(f"\n--- Chunk {i+1} (len={len(chunk)}) ---\n")
+        print(chunk)
 
-print(f"\nWrote full extracted text to: {output_path}")
 
-for i, chunk in enumerate(chunks):
-    print(f"\n--- Chunk {i+1} (len={len(chunk)}) ---\n")
-    print(chunk)
+# Guarded: large PDFs are extracted in spawned worker processes, which
+# re-import this module.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import gzip
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Local stand-in for the events backend, used to exercise process_events.py
+# (full and --sync discovery, per-event and batch result upload) offline.
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _generate_events(count: int, brochure_url: str):
+    start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        updated = start + timedelta(hours=i)
+        events.append({
+            "eventId": f"evt{i:05d}",
+            "name": f"Stub Open {i}",
+            "startDate": (datetime(2025, 10, 1) + timedelta(days=i)).strftime("%d/%m/%Y"),
+            "brochure": brochure_url if i % 3 else "",
+            "Analysis": None,
+            "updatedAt": updated.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        })
+    return events
+
+
+class StubState:
+    def __init__(self, events: list[dict], brochure_path: Path | None):
+        self.events = {str(e["eventId"]): e for e in events}
+        self.brochure_path = brochure_path
+        self.lock = threading.Lock()
+
+    def page(self, updated_since: str | None, cursor: str | None, limit: int):
+        """One feed page in (updatedAt, eventId) order.
+
+        The cursor is the (updatedAt, eventId) key of the last row returned, so
+        events updated mid-run move behind the cursor instead of shifting
+        unread rows under it (as an offset would).
+        """
+        with self.lock:
+            events = sorted(
+                (dict(e) for e in self.events.values()),
+                key=lambda e: (e["updatedAt"], str(e["eventId"])),
+            )
+        if updated_since:
+            events = [e for e in events if e["updatedAt"] >= updated_since]
+        if cursor:
+            after = tuple(json.loads(cursor))
+            events = [e for e in events if (e["updatedAt"], str(e["eventId"])) > after]
+        data = events[:limit]
+        next_cursor = None
+        if len(events) > limit:
+            last = data[-1]
+            next_cursor = json.dumps([last["updatedAt"], str(last["eventId"])])
+        return {"success": True, "data": data, "nextCursor": next_cursor}
+
+    def save_analysis(self, event_id, analysis):
+        with self.lock:
+            event = self.events.get(str(event_id))
+            if event is None:
+                return False
+            event["Analysis"] = analysis
+            event["updatedAt"] = _now()
+            return True
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload=None, body: bytes | None = None, content_type="application/json"):
+            if body is None:
+                body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return json.loads(body or b"{}")
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/api/events":
+                limit = int(query.get("limit", ["100"])[0])
+                self._send(200, state.page(query.get("updatedSince", [None])[0], query.get("cursor", [None])[0], limit))
+            elif url.path == "/api/events/all":
+                self._send(200, {"success": True, "data": list(state.events.values())})
+            elif url.path.startswith("/api/event/"):
+                event = state.events.get(url.path.rsplit("/", 1)[-1])
+                if event is None:
+                    self._send(404, {"success": False, "error": "Not found"})
+                else:
+                    self._send(200, {"success": True, "data": event})
+            elif url.path.startswith("/brochures/") and state.brochure_path:
+                self._send(200, body=state.brochure_path.read_bytes(), content_type="application/pdf")
+            else:
+                self._send(404, {"success": False, "error": "Not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            payload = self._read_json()
+            if url.path == "/api/analysis":
+                ok = state.save_analysis(payload.get("eventId"), payload.get("Analysis"))
+                self._send(200 if ok else 404, {"success": ok})
+            elif url.path == "/api/analysis/batch":
+                saved = sum(state.save_analysis(i.get("eventId"), i.get("Analysis")) for i in payload.get("items", []))
+                self._send(200, {"success": True, "saved": saved})
+            else:
+                self._send(404, {"success": False, "error": "Not found"})
+
+        def log_message(self, format, *args):
+            print(f"[stub] {self.address_string()} {format % args}")
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stub of the events API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--events", help="JSON file with a list of events (overrides --generate)")
+    parser.add_argument("--generate", type=int, default=500, help="Number of synthetic events")
+    parser.add_argument("--brochure", default="data/input/sample2.pdf", help="PDF served for every brochure URL")
+    args = parser.parse_args()
+
+    brochure_url = f"http://{args.host}:{args.port}/brochures/{Path(args.brochure).name}"
+    if args.events:
+        events = json.loads(Path(args.events).read_text(encoding="utf-8"))
+    else:
+        events = _generate_events(args.generate, brochure_url)
+
+    brochure_path = Path(args.brochure) if Path(args.brochure).exists() else None
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubState(events, brochure_path)))
+    print(f"[stub] Serving {len(events)} events on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+import heapq
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import cv2
+import fitz
+
+from src.main import (
+    IMAGE_TYPES,
+    MIN_TEXT_CHARS,
+    QR_RENDER_DPI,
+    RENDER_DPI,
+    _append_link_text,
+    _append_qr_text,
+    _collect_text_pages,
+    _extract_annotation_links,
+    _ocr_page_text,
+    _ocr_separator,
+)
+from src.pipeline import engines
+from src.pipeline.budget import PAGE_SECONDS, run_with_timeout
+from src.pipeline.chunker import chunk_text
+from src.pipeline.detector import detect_pdf_type_from_pages
+from src.pipeline.extractor import _extract_page_range, _page_ranges, extract_page_images
+from src.pipeline.images import IMAGE_MAX_DIMENSION, iter_image_pages, sniff_type
+from src.pipeline.ocr import get_ocr_profile, ocr_image_lines, ocr_pixmap_lines
+from src.pipeline.qr import decode_qr_from_image, decode_qr_from_pixmap
+from src.pipeline.tables import format_tables
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0"))
+# Estimated bytes of page/image rasters allowed in flight across all workers.
+BATCH_RASTER_BUDGET_MB = int(os.getenv("BATCH_RASTER_BUDGET_MB", "1024"))
+# Pages per text-extraction unit.
+TEXT_UNIT_PAGES = 25
+# Documents are opened (and their units queued) while fewer than
+# workers * QUEUE_DEPTH units are waiting.
+QUEUE_DEPTH = 2
+# Rasters exist as a pixmap and a BGR copy while OCR/QR runs.
+RASTER_COPIES = 2
+
+_WORKER_DOCS = {}
+_WORKER_MAX_DOCS = 4
+
+
+def _init_worker(cpu_threads: int):
+    """Limit each worker's native thread pools to its share of the CPU."""
+    cv2.setNumThreads(cpu_threads)
+    engines.OCR_CPU_THREADS = cpu_threads
+
+
+def _open_document(pdf_path: str):
+    """Open `pdf_path` in this worker, reusing the few most recent documents."""
+    doc = _WORKER_DOCS.pop(pdf_path, None)
+    if doc is None:
+        doc = fitz.open(pdf_path)
+    _WORKER_DOCS[pdf_path] = doc
+    while len(_WORKER_DOCS) > _WORKER_MAX_DOCS:
+        _WORKER_DOCS.pop(next(iter(_WORKER_DOCS))).close()
+    return doc
+
+
+def _ocr_page_unit(pdf_path: str, page_index: int, ocr_profile: str):
+    page = _open_document(pdf_path)[page_index]
+    zoom = RENDER_DPI / 72
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    return ocr_pixmap_lines(pix, source_type="rendered", profile=ocr_profile)
+
+
+def _qr_page_unit(pdf_path: str, page_index: int):
+    """QR values from the rendered page and its embedded images.
+
+    All decodes on the page share the per-page QR timeout; once it runs out
+    the unit stops and returns what it found. A decode that overruns is left
+    running (see `run_with_timeout`), so a stuck detector cannot hold the
+    worker.
+
+    Returns:
+        (rendered values, embedded-image values, reason QR was cut short or None)
+    """
+    deadline = time.monotonic() + PAGE_SECONDS["qr"]
+    doc = _open_document(pdf_path)
+    page = doc[page_index]
+    zoom = QR_RENDER_DPI / 72
+    rendered = []
+    embedded = []
+    try:
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        rendered = run_with_timeout(decode_qr_from_pixmap, deadline - time.monotonic(), pix)
+        for img in extract_page_images(doc, page, page_index + 1):
+            try:
+                embedded.extend(run_with_timeout(decode_qr_from_pixmap, deadline - time.monotonic(), img["pixmap"]))
+            except TimeoutError:
+                raise
+            except Exception as e:
+                print(f"QR scan failed for image on page {page_index + 1}: {e}")
+    except TimeoutError as e:
+        return rendered, embedded, str(e)
+    return rendered, embedded, None
+
+
+def _image_unit(image_path: str, ocr_profile: str):
+    """Page number, OCR lines, QR values and QR cut-short reason (or None) for every decoded frame of an image brochure."""
+    frames = []
+    for frame_index, img in iter_image_pages(image_path):
+        page_number = frame_index + 1
+        ocr_lines = ocr_image_lines(img, source_type="embedded", profile=ocr_profile)
+        try:
+            frames.append((page_number, ocr_lines, run_with_timeout(decode_qr_from_image, PAGE_SECONDS["qr"], img), None))
+        except TimeoutError as e:
+            frames.append((page_number, ocr_lines, [], str(e)))
+    return frames
+
+
+def _raster_bytes(width_pt: float, height_pt: float, dpi: int):
+    zoom = dpi / 72
+    return int(width_pt * zoom) * int(height_pt * zoom) * 3 * RASTER_COPIES
+
+
+class _Document:
+    """Per-document state while its units are in flight."""
+
+    def __init__(self, index: int, path: str):
+        self.index = index
+        self.path = path
+        self.started = time.monotonic()
+        self.kind = "pdf"
+        self.pending = 0
+        self.error = None
+        self.pdf_type = None
+        self.text_pages = {}
+        self.page_sizes = []
+        self.ocr = {}
+        self.rendered_qr = {}
+        self.image_qr = {}
+        self.frames = []
+        self.degraded = []
+
+    def result(self):
+        elapsed = time.monotonic() - self.started
+        if self.error:
+            return {"chunks": [], "pdf_type": self.pdf_type, "degraded": self.degraded, "elapsed": elapsed, "error": self.error}
+        text = self._image_text() if self.kind == "image" else self._pdf_text()
+        return {
+            "chunks": chunk_text(text),
+            "pdf_type": self.pdf_type,
+            "degraded": self.degraded,
+            "elapsed": elapsed,
+            "error": None,
+        }
+
+    def _pdf_text(self):
+        """Assemble text in the same order as `iter_pdf`."""
+        text_pages = [self.text_pages[i] for i in range(len(self.page_sizes))]
+        _, text = _collect_text_pages(text_pages)
+        tables = []
+        ocr_chars = 0
+        for page in text_pages:
+            page_tables = list(page["tables"])
+            ocr_text = _ocr_page_text(self.ocr.get(page["page"], []), page["page"], page_tables)
+            if ocr_text:
+                text += _ocr_separator(ocr_chars) + ocr_text
+                ocr_chars += len(ocr_text)
+            tables.extend(page_tables)
+
+        qr_results = [
+            {"page": page, "value": value}
+            for source in (self.rendered_qr, self.image_qr)
+            for page in sorted(source)
+            for value in source[page]
+        ]
+        text += _append_qr_text("", qr_results)
+        text = _append_link_text(text, _extract_annotation_links(text_pages))
+        return text + format_tables(tables)
+
+    def _image_text(self):
+        """Assemble text in the same order as `iter_image`."""
+        text = ""
+        tables = []
+        qr_results = []
+        ocr_chars = 0
+        for page_number, ocr_lines, qr_values, _ in self.frames:
+            page_tables = []
+            ocr_text = _ocr_page_text(ocr_lines, page_number, page_tables)
+            if ocr_text:
+                text += _ocr_separator(ocr_chars) + ocr_text
+                ocr_chars += len(ocr_text)
+            tables.extend(page_tables)
+            qr_results.extend({"page": page_number, "value": value} for value in qr_values)
+        return text + _append_qr_text("", qr_results) + format_tables(tables)
+
+
+class _Scheduler:
+    """Runs work units from many documents on one process pool.
+
+    Units are queued by document order, so earlier documents finish first
+    and results stream out. A unit starts only if its estimated raster size
+    fits the shared budget (a single oversized unit may run alone). While a
+    raster unit waits for room, later raster units wait behind it so it is
+    not starved, but raster-free units (text extraction) still start.
+    """
+
+    def __init__(self, pool, workers: int, raster_budget: int, ocr_profile: str):
+        self.pool = pool
+        self.workers = workers
+        self.raster_budget = raster_budget
+        self.ocr_profile = ocr_profile
+        self.queue = []
+        self.running = {}
+        self.raster_in_flight = 0
+        self._seq = 0
+
+    def push(self, doc: _Document, kind: str, func, args: tuple, raster: int = 0):
+        heapq.heappush(self.queue, (doc.index, self._seq, doc, kind, func, args, raster))
+        self._seq += 1
+        doc.pending += 1
+
+    def admit(self, doc: _Document):
+        """Queue the first units for a new document."""
+        if sniff_type(doc.path) in IMAGE_TYPES:
+            doc.kind = doc.pdf_type = "image"
+            raster = IMAGE_MAX_DIMENSION * IMAGE_MAX_DIMENSION * 3 * RASTER_COPIES
+            self.push(doc, "image", _image_unit, (doc.path, self.ocr_profile), raster)
+            return
+        with fitz.open(doc.path) as pdf:
+            doc.page_sizes = [(page.rect.width, page.rect.height) for page in pdf]
+        total = len(doc.page_sizes)
+        for start, stop in _page_ranges(total, max(1, -(-total // TEXT_UNIT_PAGES))):
+            self.push(doc, "text", _extract_page_range, (doc.path, start, stop))
+
+    def start_ready(self):
+        waiting = []
+        while self.queue and len(self.running) < self.workers:
+            item = heapq.heappop(self.queue)
+            _, _, doc, kind, func, args, raster = item
+            if raster and self.running and (waiting or self.raster_in_flight + raster > self.raster_budget):
+                waiting.append(item)
+                continue
+            future = self.pool.submit(func, *args)
+            self.running[future] = (doc, kind, args, raster)
+            self.raster_in_flight += raster
+        for item in waiting:
+            heapq.heappush(self.queue, item)
+
+    def complete(self, future):
+        """Record a finished unit; returns its document."""
+        doc, kind, args, raster = self.running.pop(future)
+        self.raster_in_flight -= raster
+        doc.pending -= 1
+        try:
+            value = future.result()
+        except Exception as e:
+            if kind in ("text", "image"):
+                doc.error = f"{kind} extraction failed: {e}"
+            else:
+                print(f"{kind.upper()} failed for {doc.path} page {args[1] + 1}: {e}")
+            return doc
+
+        if kind == "image":
+            doc.frames = value
+            for page_number, _, _, reason in value:
+                if reason:
+                    doc.degraded.append({"page": page_number, "stage": "qr", "action": "skip_qr", "reason": reason})
+        elif kind == "ocr":
+            doc.ocr[args[1] + 1] = value
+        elif kind == "qr":
+            page_number = args[1] + 1
+            doc.rendered_qr[page_number], doc.image_qr[page_number], reason = value
+            if reason:
+                doc.degraded.append({"page": page_number, "stage": "qr", "action": "skip_qr", "reason": reason})
+        elif kind == "text":
+            for page in value:
+                doc.text_pages[page["page"] - 1] = page
+            if len(doc.text_pages) == len(doc.page_sizes) and not doc.error:
+                self._queue_raster_units(doc)
+        return doc
+
+    def _queue_raster_units(self, doc: _Document):
+        text_pages = [doc.text_pages[i] for i in range(len(doc.page_sizes))]
+        doc.pdf_type = detect_pdf_type_from_pages(text_pages)
+        page_text_len, _ = _collect_text_pages(text_pages)
+        ocr_pages = doc.pdf_type in ("scanned", "hybrid")
+        for page_index, (width, height) in enumerate(doc.page_sizes):
+            page_number = page_index + 1
+            if ocr_pages and (doc.pdf_type == "scanned" or page_text_len.get(page_number, 0) < MIN_TEXT_CHARS):
+                raster = _raster_bytes(width, height, RENDER_DPI)
+                self.push(doc, "ocr", _ocr_page_unit, (doc.path, page_index, self.ocr_profile), raster)
+            raster = _raster_bytes(width, height, QR_RENDER_DPI) + sum(
+                img[2] * img[3] * 3 for img in doc.text_pages[page_index]["images"]
+            )
+            self.push(doc, "qr", _qr_page_unit, (doc.path, page_index), raster)
+
+
+def process_pdfs(
+    paths: list[str],
+    ocr_profile: str | None = None,
+    workers: int | None = None,
+    raster_budget_mb: int | None = None,
+):
+    """
+    Process many PDFs/image brochures on one shared, CPU-sized worker pool.
+
+    Work is split into units (page-range text extraction, page OCR, page QR,
+    whole-image OCR+QR) that are interleaved across documents. Each worker
+    process keeps its own OCR model and runs one unit at a time with native
+    thread pools limited to its share of the CPU, and the estimated rasters
+    in flight stay under `raster_budget_mb`. QR decoding on each page is
+    bounded by PDF_QR_PAGE_SECONDS; document and stage budgets are not
+    applied, use `process_pdf_detailed` for deadline-bound single runs.
+
+    Args:
+        paths: PDF or image brochure paths
+        ocr_profile: OCR speed/accuracy profile (fast / balanced / accurate);
+            defaults to the OCR_PROFILE environment variable
+        workers: Worker process count (defaults to BATCH_WORKERS or CPU count)
+        raster_budget_mb: Raster memory budget (defaults to BATCH_RASTER_BUDGET_MB)
+
+    Yields:
+        (path, result) as each document finishes, where result has "chunks",
+        "pdf_type", "degraded" (pages whose QR was cut short), "elapsed" and
+        "error" (None on success)
+    """
+    ocr_profile, _ = get_ocr_profile(ocr_profile)
+    cpus = os.cpu_count() or 1
+    workers = workers or BATCH_WORKERS or cpus
+    cpu_threads = max(1, cpus // workers)
+    raster_budget = (raster_budget_mb or BATCH_RASTER_BUDGET_MB) * 1024 * 1024
+    print(f"Batch: {len(paths)} documents on {workers} workers, OCR profile {ocr_profile}")
+
+    waiting = list(enumerate(paths))
+    waiting.reverse()
+    # Spawn keeps workers free of the parent's OCR model and threads.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(cpu_threads,)
+    ) as pool:
+        scheduler = _Scheduler(pool, workers, raster_budget, ocr_profile)
+        while waiting or scheduler.running or scheduler.queue:
+            while waiting and len(scheduler.queue) < workers * QUEUE_DEPTH:
+                index, path = waiting.pop()
+                doc = _Document(index, str(path))
+                try:
+                    scheduler.admit(doc)
+                except Exception as e:
+                    doc.error = f"could not open document: {e}"
+                if not doc.pending:
+                    yield doc.path, doc.result()
+
+            scheduler.start_ready()
+            if not scheduler.running:
+                continue
+            done, _ = wait(list(scheduler.running), return_when=FIRST_COMPLETED)
+            for future in done:
+                doc = scheduler.complete(future)
+                if not doc.pending:
+                    result = doc.result()
+                    print(f"Finished {doc.path}: {len(result['chunks'])} chunks in {result['elapsed']:.1f}s")
+                    yield doc.path, result
@@ -10,3 +10,11 @@ OUTPUT_DIR = os.path.join(DATA_DIR, "output")
 # Gemini only
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+# Point at scripts/mock_gemini_server.py (e.g. http://127.0.0.1:3920/v1beta/models) for offline runs
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/models")
+
+# Gemini request limits (per-minute quota and in-flight cap for batch runs)
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+GEMINI_TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TOKENS_PER_MINUTE", "1000000"))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "120"))
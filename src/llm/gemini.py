@@ -0,0 +1,222 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.config import (
+    GEMINI_API_KEY,
+    GEMINI_BASE_URL,
+    GEMINI_MODEL,
+    GEMINI_REQUESTS_PER_MINUTE,
+    GEMINI_TOKENS_PER_MINUTE,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_TIMEOUT,
+)
+from src.llm.schema import SCHEMA_INSTRUCTIONS
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 2.0
+CHARS_PER_TOKEN = 4
+
+
+def build_prompt(content: str) -> str:
+    return (
+        "Extract structured data from the brochure text and return ONLY JSON.\n\n"
+        + SCHEMA_INSTRUCTIONS.strip()
+        + "\n\nBrochure text:\n"
+        + content
+    )
+
+
+def build_payload(prompt: str) -> dict:
+    return {
+        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+        "generationConfig": {
+            "temperature": 0,
+            "response_mime_type": "application/json",
+        },
+    }
+
+
+def gemini_url(
+    model: str = GEMINI_MODEL,
+    api_key: str | None = GEMINI_API_KEY,
+    base_url: str = GEMINI_BASE_URL,
+) -> str:
+    return f"{base_url.rstrip('/')}/{model}:generateContent?key={api_key}"
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough prompt size used for the tokens/min budget (~4 chars per token)."""
+    return max(1, len(prompt) // CHARS_PER_TOKEN)
+
+
+def parse_response(data: dict):
+    """Pull the JSON document out of a generateContent response."""
+    try:
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Unexpected Gemini response format: {data}") from e
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # Fallback: return raw text if model didn't emit valid JSON
+        return {"_raw": text}
+
+
+class TokenBucket:
+    """Refilling budget of `per_minute` units, consumed by `acquire`."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # A single oversized request may take the whole bucket but never waits forever.
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class AsyncGeminiClient:
+    """asyncio Gemini client with requests/min, tokens/min and concurrency limits.
+
+    HTTP calls run on the client's own pool of `max_concurrency` threads, so
+    the cap is not limited by the event loop's default executor. Create one
+    client per event loop, share it across all requests in a batch and
+    `close` it when done.
+
+    A deadline stops waiting for a response but cannot abort a blocking HTTP
+    call. The call's concurrency slot stays taken until its thread returns,
+    so timed-out requests still count against `max_concurrency`.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = GEMINI_API_KEY,
+        model: str = GEMINI_MODEL,
+        requests_per_minute: int = GEMINI_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = GEMINI_TOKENS_PER_MINUTE,
+        max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+        timeout: float = GEMINI_TIMEOUT,
+        base_url: str = GEMINI_BASE_URL,
+    ):
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY is not set")
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="gemini")
+        self._request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "failures": 0}
+        # Seconds each HTTP call held its slot (rate-limit and queue waits excluded).
+        self.call_seconds = []
+
+    async def _acquire(self, tokens: int):
+        if self._request_bucket:
+            await self._request_bucket.acquire(1)
+        if self._token_bucket:
+            await self._token_bucket.acquire(tokens)
+
+    def close(self):
+        """Stop the HTTP threads once in-flight calls return."""
+        self._executor.shutdown(wait=False)
+
+    def _release_slot(self, loop):
+        try:
+            loop.call_soon_threadsafe(self._semaphore.release)
+        except RuntimeError:
+            # The event loop has already closed; nobody is waiting for the slot.
+            pass
+
+    def _timed_post(self, url: str, payload: dict, timeout: float):
+        started = time.perf_counter()
+        try:
+            return requests.post(url, json=payload, timeout=timeout)
+        finally:
+            self.call_seconds.append(time.perf_counter() - started)
+
+    async def _post(self, payload: dict, timeout: float):
+        """POST on the client's thread pool; takes over the already acquired slot.
+
+        The slot is released when the HTTP call finishes (or is cancelled before
+        it starts), not when the awaiting task is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        url = gemini_url(self.model, self.api_key, self.base_url)
+        try:
+            future = self._executor.submit(self._timed_post, url, payload, timeout)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._release_slot(loop))
+        return await asyncio.wrap_future(future)
+
+    async def _generate(self, prompt: str, deadline: float):
+        loop = asyncio.get_running_loop()
+        payload = build_payload(prompt)
+        tokens = estimate_tokens(prompt)
+
+        for attempt in range(MAX_RETRIES + 1):
+            await self._acquire(tokens)
+            await self._semaphore.acquire()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                self._semaphore.release()
+                raise asyncio.TimeoutError
+            self.stats["requests"] += 1
+            try:
+                r = await self._post(payload, timeout=remaining)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = RETRY_BACKOFF_SECONDS * (2 ** attempt)
+            else:
+                if r.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                    r.raise_for_status()
+                    return r.json()
+
+                if r.status_code == 429:
+                    self.stats["rate_limited"] += 1
+                try:
+                    delay = float(r.headers.get("Retry-After", ""))
+                except ValueError:
+                    delay = RETRY_BACKOFF_SECONDS * (2 ** attempt)
+            self.stats["retries"] += 1
+            await asyncio.sleep(min(delay, max(0.0, deadline - loop.time())))
+
+    async def generate(self, prompt: str, deadline: float | None = None) -> dict:
+        """Send one generateContent request and return the raw response JSON.
+
+        Args:
+            prompt: Full prompt text
+            deadline: Seconds allowed for the whole call, including time spent
+                waiting on the rate limiter and retries (defaults to `timeout`)
+        """
+        seconds = deadline if deadline is not None else self.timeout
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(self._generate(prompt, loop.time() + seconds), seconds)
+        except Exception:
+            self.stats["failures"] += 1
+            raise
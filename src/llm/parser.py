@@ -1,10 +1,18 @@
 import json
 import re
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 import requests
-from src.config import GEMINI_API_KEY, GEMINI_MODEL
-from src.llm.schema import SCHEMA_INSTRUCTIONS
+from src.config import GEMINI_API_KEY, GEMINI_TIMEOUT
+from src.llm.gemini import (
+    AsyncGeminiClient,
+    build_payload,
+    build_prompt,
+    gemini_url,
+    parse_response,
+)
+from src.pipeline.tables import TABLES_SECTION, table_kinds
 
 PRIZE_SECTION_START = (
     "PRIZE",
@@ -135,45 +143,70 @@ def _parse_with_gemini(content: str):
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY is not set")
 
-    prompt = (
-        "Extract structured data from the brochure text and return ONLY JSON.\n\n"
-        + SCHEMA_INSTRUCTIONS.strip()
-        + "\n\nBrochure text:\n"
-        + content
-    )
-
-    url = (
-        f"https://generativelanguage.googleapis.com/v1beta/models/"
-        f"{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
-    )
-    payload = {
-        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "temperature": 0,
-            "response_mime_type": "application/json",
-        },
-    }
-
-    r = requests.post(url, json=payload, timeout=120)
+    payload = build_payload(build_prompt(content))
+    r = requests.post(gemini_url(), json=payload, timeout=GEMINI_TIMEOUT)
     r.raise_for_status()
-    data = r.json()
-
-    try:
-        text = data["candidates"][0]["content"]["parts"][0]["text"]
-    except (KeyError, IndexError, TypeError) as e:
-        raise ValueError(f"Unexpected Gemini response format: {data}") from e
-
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # Fallback: return raw text if model didn't emit valid JSON
-        return {"_raw": text}
+    return parse_response(r.json())
 
 
-def parse_with_llm(content: str, output_path: str | Path | None = None):
-    content = _normalize_prize_text(content)
-    content = _append_normalized_table_lines(content)
-    result = _parse_with_gemini(content)
+def _table_rows(section: str) -> list[tuple[str, ...]]:
+    rows = []
+    for line in section.splitlines():
+        if line.startswith("[") or " | " not in line:
+            continue
+        rows.append(tuple(" ".join(cell.split()) for cell in line.split(" | ")))
+    return rows
+
+
+def _drop_table_source_lines(text: str, section: str) -> str:
+    """Remove raw lines that a rebuilt table repeats, so the prompt carries each table once.
+
+    A row's raw text is dropped only where its cells appear in order on
+    consecutive lines (how PyMuPDF and OCR emit table cells) or together on one
+    line; everything else, including text the table detector skipped, stays.
+    """
+    remaining = Counter(_table_rows(section))
+    if not remaining:
+        return text
+    joined = {" ".join(row): row for row in remaining}
+    by_first_cell = {}
+    for row in remaining:
+        by_first_cell.setdefault(row[0], []).append(row)
+
+    lines = text.split("\n")
+    stripped = [" ".join(line.split()) for line in lines]
+    keep = [True] * len(lines)
+    for i, line in enumerate(stripped):
+        if not keep[i] or not line:
+            continue
+        row = joined.get(line)
+        if row and remaining[row]:
+            keep[i] = False
+            remaining[row] -= 1
+            continue
+        for row in by_first_cell.get(line, []):
+            span = len(row)
+            if remaining[row] and stripped[i:i + span] == list(row) and all(keep[i:i + span]):
+                keep[i:i + span] = [False] * span
+                remaining[row] -= 1
+                break
+    return "\n".join(line for line, kept in zip(lines, keep) if kept)
+
+
+def _prepare_content(content: str) -> str:
+    # Rebuilt tables replace the raw lines they came from. A rebuilt prize
+    # table also replaces the regex-normalized copies; other tables (schedule,
+    # entry fee) don't cover the prize text, so normalization still runs.
+    text, found, tables = content.partition(TABLES_SECTION)
+    if not found:
+        return _append_normalized_table_lines(_normalize_prize_text(text))
+    text = _drop_table_source_lines(text, tables)
+    if "prize" not in table_kinds(content):
+        text = _append_normalized_table_lines(_normalize_prize_text(text))
+    return text.rstrip("\n") + "\n\n" + found + tables
+
+
+def _write_result(result, output_path: str | Path | None):
     if output_path is None:
         output_dir = Path("data/llm")
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -183,4 +216,30 @@ def parse_with_llm(content: str, output_path: str | Path | None = None):
         output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as f:
         json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+def parse_with_llm(content: str, output_path: str | Path | None = None):
+    content = _prepare_content(content)
+    result = _parse_with_gemini(content)
+    _write_result(result, output_path)
+    return result
+
+
+async def parse_with_llm_async(
+    content: str,
+    output_path: str | Path | None = None,
+    client: AsyncGeminiClient | None = None,
+    deadline: float | None = None,
+):
+    """Async `parse_with_llm`; pass a shared client so batch runs share rate limits."""
+    content = _prepare_content(content)
+    own_client = client is None
+    client = client or AsyncGeminiClient()
+    try:
+        data = await client.generate(build_prompt(content), deadline=deadline)
+    finally:
+        if own_client:
+            client.close()
+    result = parse_response(data)
+    _write_result(result, output_path)
     return result
@@ -2,6 +2,7 @@ SCHEMA_INSTRUCTIONS = """
 You must return a JSON object that follows this schema (TypeScript/Zod).
 Important parsing guidance:
 - The brochure text may contain flattened tables where ranks, categories, and amounts appear on the same line or columnar layout is lost.
+- When a "=== TABLES ===" section is present, it lists tables rebuilt from the page layout: one row per line, cells separated by " | ", empty cells kept so columns line up, and the first row is usually the header. Prefer these rows over the flattened text for prizes, schedules and entry fees.
 - Infer prize mappings by proximity and ordering. Example: "1st 2500 2nd 2000 3rd 1500 Trophy" means 1st=2500, 2nd=2000, 3rd=1500, and Trophy is a non-cash award.
 - If a line contains category words (e.g., Best, Female, Veteran, Youngest, Oldest, U-15, U-19), map the nearest amount or non-cash award to that category.
 - If amounts are missing but awards like Trophy/Certificate appear, capture them in prizeFund.nonCashAwards and/or specialPrizes with amount null.
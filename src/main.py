@@ -1,20 +1,57 @@
+import time
+
 import fitz
 
-from src.pipeline.detector import detect_pdf_type
-from src.pipeline.extractor import extract_text, extract_images
-from src.pipeline.ocr import ocr_pixmap
-from src.pipeline.qr import decode_qr_from_pixmap
+from src.profiling import profile_stage, profiled, record_native, start_profiling, stop_profiling
+from src.pipeline.budget import TimeBudget, run_with_timeout
+from src.pipeline.detector import detect_pdf_type_from_pages
+from src.pipeline.extractor import extract_pages, extract_images, extract_page_images
+from src.pipeline.ocr import (
+    ocr_pixmap,
+    ocr_pixmap_lines,
+    ocr_image_lines,
+    ocr_cache_stats,
+    get_ocr_profile,
+)
+from src.pipeline.qr import decode_qr_from_pixmap, decode_qr_from_image
+from src.pipeline.images import downscale_image, image_page_count, iter_image_pages, sniff_type
 from src.pipeline.cleaner import clean_text
-from src.pipeline.chunker import chunk_text
+from src.pipeline.chunker import ChunkStream
+from src.pipeline.tables import detect_tables, format_tables, words_from_ocr_lines
 
 MIN_TEXT_CHARS = 50
 RENDER_DPI = 300
+# Fallback DPI for pages whose expected OCR cost no longer fits the time budget.
+DEGRADED_RENDER_DPI = 150
 QR_RENDER_DPI = 200
+# Image brochures are shrunk by this factor when the OCR budget is tight.
+DEGRADED_IMAGE_SCALE = 0.5
+IMAGE_TYPES = ("jpeg", "png", "webp", "tiff")
+
+
+class _ChunkEvents:
+    """Feeds text through a ChunkStream and wraps finished chunks as events."""
+
+    def __init__(self):
+        self.stream = ChunkStream()
+        self.count = 0
+        self.chars = 0
+
+    def _events(self, chunks):
+        for chunk in chunks:
+            yield {"type": "chunk", "index": self.count, "text": chunk}
+            self.count += 1
 
+    def feed(self, text: str):
+        self.chars += len(text)
+        return self._events(self.stream.feed(text))
 
-def _collect_text_pages(pdf_path: str):
-    """Extract and clean text for all pages, including empty pages."""
-    text_pages = extract_text(pdf_path, include_empty=True)
+    def flush(self):
+        return self._events(self.stream.flush())
+
+
+def _collect_text_pages(text_pages: list[dict]):
+    """Clean text for all pages, including empty pages."""
     full_text_parts = []
     page_text_len = {}
 
@@ -24,43 +61,48 @@ def _collect_text_pages(pdf_path: str):
         full_text_parts.append(cleaned)
 
     full_text = "\n\n".join(full_text_parts) + ("\n\n" if full_text_parts else "")
-    return text_pages, page_text_len, full_text
-
-
-def _ocr_rendered_pages(pdf_path: str, pdf_type: str, page_text_len: dict):
-    """OCR full rendered pages for scanned or low-text pages."""
-    ocr_results = []
-    pages_ocr_full = set()
+    return page_text_len, full_text
 
-    if pdf_type not in ("scanned", "hybrid"):
-        return ocr_results, pages_ocr_full
-
-    print("Running OCR on rendered pages...")
-    doc = fitz.open(pdf_path)
-    for page_index, page in enumerate(doc):
-        page_number = page_index + 1
-        text_len = page_text_len.get(page_number, 0)
-        should_ocr = pdf_type == "scanned" or text_len < MIN_TEXT_CHARS
-
-        if not should_ocr:
-            continue
-
-        try:
-            zoom = RENDER_DPI / 72  # render at target DPI
-            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
-            ocr_text = ocr_pixmap(pix, source_type="rendered", use_angle_cls=True)
-            if ocr_text and len(ocr_text.strip()) > 0:
-                ocr_results.append(ocr_text)
-                pages_ocr_full.add(page_number)
-                print(f"OCR completed for page {page_number}: {len(ocr_text)} chars")
-        except Exception as e:
-            print(f"OCR failed for page {page_number}: {e}")
 
-    doc.close()
-    return ocr_results, pages_ocr_full
+def _ocr_rendered_page(page, page_number: int, ocr_profile: str, budget: TimeBudget, page_cost: float):
+    """OCR one full rendered page (scanned or low-text pages).
 
+    The page is rendered at DEGRADED_RENDER_DPI when `page_cost` (estimated
+    full-DPI seconds per page) no longer fits the budget, and skipped (text
+    layer only) once the OCR budget is spent.
 
-def _ocr_embedded_images(pdf_path: str, pdf_type: str, pages_ocr_full: set):
+    Returns:
+        (OCR lines, updated page cost estimate)
+    """
+    if budget.expired("ocr"):
+        budget.degrade(page_number, "ocr", "text_layer_only", "OCR time budget spent")
+        return [], page_cost
+
+    dpi = RENDER_DPI
+    if page_cost > budget.page_timeout("ocr"):
+        dpi = DEGRADED_RENDER_DPI
+        budget.degrade(page_number, "ocr", f"render_{dpi}dpi", f"expected {page_cost:.1f}s per page")
+
+    try:
+        started = time.monotonic()
+        zoom = dpi / 72  # render at target DPI
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        record_native("rendered page pixmap", pix.stride * pix.height)
+        ocr_lines = ocr_pixmap_lines(pix, source_type="rendered", profile=ocr_profile)
+        page_cost = (time.monotonic() - started) * (RENDER_DPI / dpi) ** 2
+        return ocr_lines, page_cost
+    except Exception as e:
+        print(f"OCR failed for page {page_number}: {e}")
+    return [], page_cost
+
+
+def _ocr_embedded_images(
+    pdf_path: str,
+    pdf_type: str,
+    pages_ocr_full: set,
+    ocr_profile: str,
+    budget: TimeBudget,
+):
     """OCR embedded images to capture text in figures/screenshots."""
     ocr_results = []
 
@@ -74,8 +116,11 @@ def _ocr_embedded_images(pdf_path: str, pdf_type: str, pages_ocr_full: set):
     for i, img in enumerate(images):
         if img["page"] in pages_ocr_full:
             continue
+        if budget.expired("ocr"):
+            budget.degrade(img["page"], "ocr", "skip_image_ocr", "OCR time budget spent")
+            continue
         try:
-            ocr_text = ocr_pixmap(img["pixmap"], source_type="embedded", use_angle_cls=True)
+            ocr_text = ocr_pixmap(img["pixmap"], source_type="embedded", profile=ocr_profile)
             if ocr_text and len(ocr_text.strip()) > 0:
                 ocr_results.append(ocr_text)
                 print(f"OCR completed for image {i+1}/{len(images)}: {len(ocr_text)} chars")
@@ -85,53 +130,77 @@ def _ocr_embedded_images(pdf_path: str, pdf_type: str, pages_ocr_full: set):
     return ocr_results
 
 
-def _append_ocr_text(full_text: str, ocr_results: list[str]):
-    """Append OCR text to the full text with a separator."""
-    if not ocr_results:
-        return full_text
+def _decode_qr_within_budget(image, page_number: int, budget: TimeBudget, decode=decode_qr_from_pixmap):
+    """Decode QR codes, giving up on the page when it overruns its QR timeout."""
+    if budget.expired("qr"):
+        budget.degrade(page_number, "qr", "skip_qr", "QR time budget spent")
+        return []
+    try:
+        return run_with_timeout(profiled(decode), budget.page_timeout("qr"), image)
+    except TimeoutError as e:
+        budget.degrade(page_number, "qr", "skip_qr", str(e))
+        return []
 
-    full_text += "\n\n=== OCR EXTRACTED TEXT ===\n\n"
-    full_text += "\n\n".join(ocr_results)
-    print(f"Total OCR text added: {sum(len(t) for t in ocr_results)} chars")
-    return full_text
 
+def _qr_from_rendered_page(page, page_number: int, deadline: float):
+    """Decode QR codes from one rendered page.
 
-def _qr_from_rendered_pages(pdf_path: str):
-    """Decode QR codes from rendered pages."""
+    Raises:
+        TimeoutError: the page's QR deadline passed
+    """
     results = []
-    doc = fitz.open(pdf_path)
-
-    print("Scanning rendered pages for QR codes...")
     zoom = QR_RENDER_DPI / 72
-    for page_index, page in enumerate(doc):
-        page_number = page_index + 1
-        try:
-            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
-            qr_values = decode_qr_from_pixmap(pix)
-            for value in qr_values:
-                results.append({"page": page_number, "value": value})
-        except Exception as e:
-            print(f"QR scan failed for page {page_number}: {e}")
-
-    doc.close()
+    try:
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        record_native("QR page pixmap", pix.stride * pix.height)
+        qr_values = run_with_timeout(profiled(decode_qr_from_pixmap), deadline - time.monotonic(), pix)
+        for value in qr_values:
+            results.append({"page": page_number, "value": value})
+    except TimeoutError:
+        raise
+    except Exception as e:
+        print(f"QR scan failed for page {page_number}: {e}")
     return results
 
 
-def _qr_from_embedded_images(pdf_path: str):
-    """Decode QR codes from embedded images."""
-    results = []
-    images = extract_images(pdf_path)
+def _qr_from_page_images(doc, page, page_number: int, deadline: float, results: list[dict]):
+    """Decode QR codes from the embedded images of one page into `results`.
 
-    print(f"Scanning {len(images)} embedded images for QR codes...")
-    for img in images:
+    Raises:
+        TimeoutError: the page's QR deadline passed; `results` keeps what was found
+    """
+    for img in extract_page_images(doc, page, page_number):
         try:
-            qr_values = decode_qr_from_pixmap(img["pixmap"])
+            qr_values = run_with_timeout(profiled(decode_qr_from_pixmap), deadline - time.monotonic(), img["pixmap"])
             for value in qr_values:
                 results.append({"page": img["page"], "value": value})
+        except TimeoutError:
+            raise
         except Exception as e:
             print(f"QR scan failed for image on page {img['page']}: {e}")
 
-    return results
+
+def _qr_from_page(doc, page, page_number: int, budget: TimeBudget):
+    """QR codes from the rendered page and its embedded images.
+
+    All decodes on the page share one per-page QR timeout (as in the batch
+    `_qr_page_unit`); once it runs out the rest of the page is skipped.
+
+    Returns:
+        (rendered-page results, embedded-image results)
+    """
+    rendered = []
+    embedded = []
+    if budget.expired("qr"):
+        budget.degrade(page_number, "qr", "skip_qr", "QR time budget spent")
+        return rendered, embedded
+    deadline = time.monotonic() + budget.page_timeout("qr")
+    try:
+        rendered = _qr_from_rendered_page(page, page_number, deadline)
+        _qr_from_page_images(doc, page, page_number, deadline, embedded)
+    except TimeoutError as e:
+        budget.degrade(page_number, "qr", "skip_qr", str(e))
+    return rendered, embedded
 
 
 def _append_qr_text(full_text: str, qr_results: list[dict]):
@@ -157,24 +226,14 @@ def _append_qr_text(full_text: str, qr_results: list[dict]):
     return full_text
 
 
-def _extract_annotation_links(pdf_path: str):
-    """Extract URL links from PDF annotations."""
-    results = []
-    doc = fitz.open(pdf_path)
-
+def _extract_annotation_links(text_pages: list[dict]):
+    """Collect URL links from PDF annotations gathered by `extract_pages`."""
     print("Scanning annotation links...")
-    for page_index, page in enumerate(doc):
-        page_number = page_index + 1
-        try:
-            for link in page.get_links():
-                uri = link.get("uri")
-                if uri:
-                    results.append({"page": page_number, "value": uri})
-        except Exception as e:
-            print(f"Annotation link scan failed for page {page_number}: {e}")
-
-    doc.close()
-    return results
+    return [
+        {"page": page["page"], "value": uri}
+        for page in text_pages
+        for uri in page["links"]
+    ]
 
 
 def _append_link_text(full_text: str, link_results: list[dict]):
@@ -200,42 +259,293 @@ def _append_link_text(full_text: str, link_results: list[dict]):
     return full_text
 
 
-def process_pdf(pdf_path: str):
+def _ocr_image_page(img, page_number: int, ocr_profile: str, budget: TimeBudget, page_cost: float):
+    """OCR one decoded image page; shrinks it when `page_cost` no longer fits the budget.
+
+    Returns:
+        (OCR lines, updated page cost estimate)
     """
-    Process PDF and extract all text content.
-    
+    if budget.expired("ocr"):
+        budget.degrade(page_number, "ocr", "skip_ocr", "OCR time budget spent")
+        return [], page_cost
+
+    scale = 1.0
+    if page_cost > budget.page_timeout("ocr"):
+        scale = DEGRADED_IMAGE_SCALE
+        img = downscale_image(img, int(max(img.shape[:2]) * scale))
+        budget.degrade(page_number, "ocr", f"downscale_{scale:g}x", f"expected {page_cost:.1f}s per page")
+
+    try:
+        started = time.monotonic()
+        ocr_lines = ocr_image_lines(img, source_type="embedded", profile=ocr_profile)
+        page_cost = (time.monotonic() - started) / scale ** 2
+        return ocr_lines, page_cost
+    except Exception as e:
+        print(f"OCR failed for page {page_number}: {e}")
+    return [], page_cost
+
+
+def _ocr_page_text(ocr_lines: list[dict], page_number: int, page_tables: list[dict]):
+    """Join OCR lines into page text and add tables rebuilt from their boxes."""
+    ocr_text = "\n".join(line["text"] for line in ocr_lines)
+    if not ocr_text.strip():
+        return ""
+    print(f"OCR completed for page {page_number}: {len(ocr_text)} chars")
+    page_tables.extend(detect_tables(words_from_ocr_lines(ocr_lines), page_number))
+    return ocr_text
+
+
+def _ocr_separator(ocr_chars: int):
+    return "\n\n" if ocr_chars else "\n\n=== OCR EXTRACTED TEXT ===\n\n"
+
+
+def _log_ocr_totals(ocr_chars: int):
+    if ocr_chars:
+        print(f"Total OCR text added: {ocr_chars} chars")
+    cache_stats = ocr_cache_stats()
+    if cache_stats and (cache_stats["hits"] or cache_stats["misses"]):
+        print(f"OCR cache: {cache_stats}")
+
+
+def _finish(chunks: _ChunkEvents, budget: TimeBudget, pdf_type: str):
+    """Flush the last chunk and yield the "done" summary event."""
+    print(f"Total text length: {chunks.chars} characters")
+    yield from chunks.flush()
+    print(f"Created {chunks.count} chunks")
+    if budget.degraded:
+        print(f"Degraded {len(budget.degraded)} page steps to stay within the time budget")
+
+    yield {
+        "type": "done",
+        "pdf_type": pdf_type,
+        "chunks": chunks.count,
+        "degraded": budget.degraded,
+        "elapsed": budget.elapsed(),
+    }
+
+
+def iter_pdf(pdf_path: str, ocr_profile: str | None = None, budget: TimeBudget | None = None):
+    """
+    Process a PDF page by page, yielding results as soon as they are ready.
+
+    Only one page raster is alive at a time. Chunks come out in the same order
+    and with the same content as `process_pdf` returns them; text-layer chunks
+    are emitted before any OCR runs.
+
     Args:
         pdf_path: Path to PDF file
-        
-    Returns:
-        List of text chunks
+        ocr_profile: OCR speed/accuracy profile (fast / balanced / accurate);
+            defaults to the OCR_PROFILE environment variable
+        budget: Document/stage/page deadlines (defaults from PDF_*_SECONDS env vars)
+
+    Yields:
+        Dicts tagged by "type":
+        - "chunk": {"index", "text"} for each finished chunk
+        - "page": {"page", "text", "ocr", "qr", "links", "tables"} once a page is done
+        - "done": {"pdf_type", "chunks", "degraded", "elapsed"} at the end
     """
-    # Detect PDF type to choose the OCR strategy.
-    pdf_type = detect_pdf_type(pdf_path)
-    print(f"PDF type: {pdf_type}")
-
-    # Extract text layer first; OCR fills gaps.
-    text_pages, page_text_len, full_text = _collect_text_pages(pdf_path)
+    budget = budget or TimeBudget()
+    ocr_profile, _ = get_ocr_profile(ocr_profile)
+    print(f"OCR profile: {ocr_profile}")
+    chunks = _ChunkEvents()
+
+    with profile_stage("extract"):
+        # One pass over the document (page-range parallel for large files) feeds
+        # type detection, the text layer and annotation links.
+        text_pages = extract_pages(pdf_path)
+
+        # Detect PDF type to choose the OCR strategy.
+        pdf_type = detect_pdf_type_from_pages(text_pages)
+        print(f"PDF type: {pdf_type}")
+
+        # Extract text layer first; OCR fills gaps.
+        page_text_len, full_text = _collect_text_pages(text_pages)
     print(f"Extracted text from {len(text_pages)} pages")
+    yield from chunks.feed(full_text)
+
+    # OCR full pages when needed and decode QR codes (rendered page + embedded
+    # images), one page at a time. Embedded image OCR stays disabled for speed.
+    ocr_pages = pdf_type in ("scanned", "hybrid")
+    if ocr_pages:
+        print("Running OCR on rendered pages...")
+    print("Scanning pages for QR codes...")
+    ocr_chars = 0
+    page_cost = 0.0
+    rendered_qr = []
+    image_qr = []
+    tables = []
+    doc = fitz.open(pdf_path)
+    try:
+        for page_index, page in enumerate(doc):
+            page_number = page_index + 1
+            ocr_text = ""
+            page_tables = list(text_pages[page_index]["tables"])
+            if ocr_pages and (pdf_type == "scanned" or page_text_len.get(page_number, 0) < MIN_TEXT_CHARS):
+                with budget.stage("ocr"), profile_stage("ocr"):
+                    ocr_lines, page_cost = _ocr_rendered_page(page, page_number, ocr_profile, budget, page_cost)
+                ocr_text = _ocr_page_text(ocr_lines, page_number, page_tables)
+                if ocr_text:
+                    yield from chunks.feed(_ocr_separator(ocr_chars) + ocr_text)
+                    ocr_chars += len(ocr_text)
+
+            with budget.stage("qr"), profile_stage("qr"):
+                page_qr, page_image_qr = _qr_from_page(doc, page, page_number, budget)
+            rendered_qr.extend(page_qr)
+            image_qr.extend(page_image_qr)
+            tables.extend(page_tables)
+
+            yield {
+                "type": "page",
+                "page": page_number,
+                "text": text_pages[page_index]["content"],
+                "ocr": ocr_text,
+                "qr": [item["value"] for item in page_qr + page_image_qr],
+                "links": text_pages[page_index]["links"],
+                "tables": page_tables,
+            }
+    finally:
+        doc.close()
+
+    _log_ocr_totals(ocr_chars)
+
+    # QR codes, link annotations (clickable text in PDFs), then tables
+    # rebuilt from word/OCR box positions.
+    with profile_stage("output"):
+        tail = _append_qr_text("", rendered_qr + image_qr)
+        tail = _append_link_text(tail, _extract_annotation_links(text_pages))
+        tail += format_tables(tables)
+    if tables:
+        print(f"Tables found: {len(tables)}")
+    yield from chunks.feed(tail)
+    yield from _finish(chunks, budget, pdf_type)
+
+
+def iter_image(image_path: str, ocr_profile: str | None = None, budget: TimeBudget | None = None):
+    """
+    Process a JPG/PNG/WebP/TIFF brochure, yielding the same events as `iter_pdf`.
 
-    # OCR full pages when needed, then OCR embedded images for digital/hybrid PDFs.
-    rendered_ocr, pages_ocr_full = _ocr_rendered_pages(pdf_path, pdf_type, page_text_len)
-    # Temporarily disable embedded image OCR to speed up processing.
-    image_ocr = []
-    full_text = _append_ocr_text(full_text, rendered_ocr + image_ocr)
-
-    # QR extraction from both rendered pages and embedded images.
-    qr_results = _qr_from_rendered_pages(pdf_path) + _qr_from_embedded_images(pdf_path)
-    full_text = _append_qr_text(full_text, qr_results)
-
-    # Extract link annotations (clickable text in PDFs).
-    link_results = _extract_annotation_links(pdf_path)
-    full_text = _append_link_text(full_text, link_results)
+    Images are decoded (and downscaled) straight into the OCR and QR raster
+    path; there is no PDF type detection, text layer or link extraction.
+    Multi-page TIFFs yield one page per frame.
+    """
+    budget = budget or TimeBudget()
+    ocr_profile, _ = get_ocr_profile(ocr_profile)
+    print(f"OCR profile: {ocr_profile}")
+    chunks = _ChunkEvents()
+
+    with profile_stage("extract"):
+        page_count = image_page_count(image_path)
+        frames = iter_image_pages(image_path)
+    print(f"Image brochure with {page_count} page(s)")
+
+    ocr_chars = 0
+    page_cost = 0.0
+    qr_results = []
+    tables = []
+    while True:
+        # Frames are decoded lazily, one at a time, so only the current one is held.
+        with profile_stage("extract"):
+            frame = next(frames, None)
+        if frame is None:
+            break
+        frame_index, img = frame
+        page_number = frame_index + 1
+        page_tables = []
+
+        with budget.stage("ocr"), profile_stage("ocr"):
+            ocr_lines, page_cost = _ocr_image_page(img, page_number, ocr_profile, budget, page_cost)
+        ocr_text = _ocr_page_text(ocr_lines, page_number, page_tables)
+        if ocr_text:
+            yield from chunks.feed(_ocr_separator(ocr_chars) + ocr_text)
+            ocr_chars += len(ocr_text)
+
+        with budget.stage("qr"), profile_stage("qr"):
+            page_qr = [
+                {"page": page_number, "value": value}
+                for value in _decode_qr_within_budget(img, page_number, budget, decode_qr_from_image)
+            ]
+        qr_results.extend(page_qr)
+        tables.extend(page_tables)
+
+        yield {
+            "type": "page",
+            "page": page_number,
+            "text": "",
+            "ocr": ocr_text,
+            "qr": [item["value"] for item in page_qr],
+            "links": [],
+            "tables": page_tables,
+        }
+
+    _log_ocr_totals(ocr_chars)
+
+    with profile_stage("output"):
+        tail = _append_qr_text("", qr_results) + format_tables(tables)
+    if tables:
+        print(f"Tables found: {len(tables)}")
+    yield from chunks.feed(tail)
+    yield from _finish(chunks, budget, "image")
+
+
+def iter_document(path: str, ocr_profile: str | None = None, budget: TimeBudget | None = None):
+    """Sniff the file type from its bytes and stream it through `iter_image` or `iter_pdf`."""
+    kind = sniff_type(path)
+    if kind in IMAGE_TYPES:
+        print(f"Detected {kind} image brochure")
+        return iter_image(path, ocr_profile=ocr_profile, budget=budget)
+    return iter_pdf(path, ocr_profile=ocr_profile, budget=budget)
+
+
+def process_pdf_detailed(
+    pdf_path: str,
+    ocr_profile: str | None = None,
+    budget: TimeBudget | None = None,
+    profile_path: str | None = None,
+):
+    """
+    Process PDF within a time budget and report which pages were degraded.
 
-    print(f"Total text length: {len(full_text)} characters")
+    Image brochures (JPG/PNG/WebP/TIFF, detected from the file bytes) take the
+    direct image path in `iter_image`.
     
-    # Chunk the final text for downstream processing.
-    chunks = chunk_text(full_text)
-    print(f"Created {len(chunks)} chunks")
+    Args:
+        pdf_path: Path to PDF or image file
+        ocr_profile: OCR speed/accuracy profile (fast / balanced / accurate);
+            defaults to the OCR_PROFILE environment variable
+        budget: Document/stage/page deadlines (defaults from PDF_*_SECONDS env vars)
+        profile_path: When set, profile each stage (cProfile + tracemalloc)
+            and write the report to this path
+        
+    Returns:
+        Dict with "chunks", "degraded" (list of page/stage/action/reason records)
+        and "elapsed" seconds
+    """
+    chunks = []
+    summary = {}
+    profiler = start_profiling() if profile_path else None
+    try:
+        for event in iter_document(pdf_path, ocr_profile=ocr_profile, budget=budget):
+            if event["type"] == "chunk":
+                chunks.append(event["text"])
+            elif event["type"] == "done":
+                summary = event
+    finally:
+        if profiler:
+            stop_profiling()
+            profiler.write(profile_path)
+    return {"chunks": chunks, "degraded": summary["degraded"], "elapsed": summary["elapsed"]}
+
+
+def process_pdf(pdf_path: str, ocr_profile: str | None = None):
+    """
+    Process PDF and extract all text content.
     
-    return chunks
+    Args:
+        pdf_path: Path to PDF file
+        ocr_profile: OCR speed/accuracy profile (fast / balanced / accurate);
+            defaults to the OCR_PROFILE environment variable
+        
+    Returns:
+        List of text chunks
+    """
+    return process_pdf_detailed(pdf_path, ocr_profile=ocr_profile)["chunks"]
@@ -0,0 +1,130 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+DOCUMENT_SECONDS = float(os.getenv("PDF_DOCUMENT_SECONDS", "300"))
+STAGE_SECONDS = {
+    "ocr": float(os.getenv("PDF_OCR_SECONDS", "240")),
+    "qr": float(os.getenv("PDF_QR_SECONDS", "60")),
+}
+PAGE_SECONDS = {
+    "ocr": float(os.getenv("PDF_OCR_PAGE_SECONDS", "30")),
+    "qr": float(os.getenv("PDF_QR_PAGE_SECONDS", "10")),
+}
+# Timed-out calls keep running (native code can't be interrupted) and hold
+# their inputs and a CPU. Past this many, run_with_timeout refuses new calls.
+MAX_ABANDONED_CALLS = int(os.getenv("PDF_MAX_ABANDONED_CALLS", "2"))
+
+_abandoned = []
+_abandoned_lock = threading.Lock()
+
+
+class TimeBudget:
+    """Wall-clock deadlines for one document, its stages and individual pages.
+
+    Stage budgets count time spent inside `stage(...)` blocks, so stages may
+    interleave page by page. Stages check the budget between pages and degrade
+    work instead of failing; every degraded page is recorded in `degraded`.
+    """
+
+    def __init__(
+        self,
+        document_seconds: float | None = DOCUMENT_SECONDS,
+        stage_seconds: dict | None = None,
+        page_seconds: dict | None = None,
+    ):
+        self.started = time.monotonic()
+        self.document_seconds = document_seconds
+        self.stage_seconds = {**STAGE_SECONDS, **(stage_seconds or {})}
+        self.page_seconds = {**PAGE_SECONDS, **(page_seconds or {})}
+        self.degraded = []
+        self._stage_spent = {}
+        self._stage_started = {}
+
+    @contextmanager
+    def stage(self, stage: str):
+        started = time.monotonic()
+        self._stage_started[stage] = started
+        try:
+            yield
+        finally:
+            del self._stage_started[stage]
+            self._stage_spent[stage] = self._stage_spent.get(stage, 0.0) + time.monotonic() - started
+
+    def remaining(self, stage: str | None = None) -> float:
+        """Seconds left for `stage`, capped by what is left for the document."""
+        now = time.monotonic()
+        left = float("inf")
+        if self.document_seconds:
+            left = self.document_seconds - (now - self.started)
+        limit = self.stage_seconds.get(stage)
+        if limit:
+            spent = self._stage_spent.get(stage, 0.0)
+            if stage in self._stage_started:
+                spent += now - self._stage_started[stage]
+            left = min(left, limit - spent)
+        return left
+
+    def expired(self, stage: str | None = None) -> bool:
+        return self.remaining(stage) <= 0
+
+    def page_timeout(self, stage: str) -> float:
+        return min(self.page_seconds.get(stage) or float("inf"), self.remaining(stage))
+
+    def degrade(self, page: int, stage: str, action: str, reason: str):
+        self.degraded.append({"page": page, "stage": stage, "action": action, "reason": reason})
+        print(f"Page {page} {stage} degraded ({action}): {reason}")
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+def abandoned_calls() -> int:
+    """Number of timed-out calls whose threads are still running."""
+    with _abandoned_lock:
+        _abandoned[:] = [t for t in _abandoned if t.is_alive()]
+        return len(_abandoned)
+
+
+def run_with_timeout(func, timeout: float, *args, **kwargs):
+    """Run `func` in a daemon thread and give up after `timeout` seconds.
+
+    Python cannot interrupt native code, so an overrunning call keeps running in
+    the background and its result is discarded; only use this for calls that
+    share no state with later work (e.g. a per-call cv2.QRCodeDetector). While
+    MAX_ABANDONED_CALLS such calls are still running, new calls fail at once
+    instead of piling up more stuck threads.
+
+    Raises:
+        TimeoutError: the call did not finish in time, or too many earlier
+            calls are still stuck
+    """
+    if timeout == float("inf"):
+        return func(*args, **kwargs)
+    if timeout <= 0:
+        raise TimeoutError("no time left")
+    stuck = abandoned_calls()
+    if stuck >= MAX_ABANDONED_CALLS:
+        raise TimeoutError(f"{stuck} timed-out calls still running")
+
+    result = queue.Queue(maxsize=1)
+
+    def target():
+        try:
+            result.put((True, func(*args, **kwargs)))
+        except BaseException as e:
+            result.put((False, e))
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    try:
+        ok, value = result.get(timeout=timeout)
+    except queue.Empty:
+        with _abandoned_lock:
+            _abandoned.append(thread)
+        raise TimeoutError(f"timed out after {timeout:.1f}s") from None
+    if not ok:
+        raise value
+    return value
@@ -12,3 +12,41 @@ def chunk_text(text: str, max_chars=2000):
         chunks.append(current)
 
     return chunks
+
+
+class ChunkStream:
+    """Incremental `chunk_text`: feed text pieces, get chunks as they fill.
+
+    Feeding the pieces of a string and then calling `flush` yields exactly
+    `chunk_text(<whole string>, max_chars)`.
+    """
+
+    def __init__(self, max_chars=2000):
+        self.max_chars = max_chars
+        self._current = ""
+        self._pending = ""
+
+    def _add_line(self, line):
+        chunk = None
+        if len(self._current) + len(line) > self.max_chars:
+            chunk = self._current
+            self._current = ""
+        self._current += line + "\n"
+        return chunk
+
+    def feed(self, text: str):
+        self._pending += text
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            chunk = self._add_line(line)
+            if chunk is not None:
+                yield chunk
+
+    def flush(self):
+        chunk = self._add_line(self._pending)
+        self._pending = ""
+        if chunk is not None:
+            yield chunk
+        if self._current:
+            yield self._current
+            self._current = ""
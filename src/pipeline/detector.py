@@ -30,7 +30,26 @@ def detect_pdf_type(pdf_path: str) -> str:
             image_pages += 1
 
     doc.close()
+    return _classify(text_pages, image_pages, total_pages)
 
+
+def detect_pdf_type_from_pages(pages: list[dict]) -> str:
+    """Same as `detect_pdf_type`, using records from `extract_pages`."""
+    text_pages = 0
+    image_pages = 0
+
+    for page in pages:
+        text = page["content"].strip()
+        if text and len(text) > MIN_TEXT_CHARS:
+            text_pages += 1
+
+        if page["images"]:
+            image_pages += 1
+
+    return _classify(text_pages, image_pages, len(pages))
+
+
+def _classify(text_pages: int, image_pages: int, total_pages: int) -> str:
     text_ratio = text_pages / total_pages if total_pages > 0 else 0
 
     if text_pages == 0:
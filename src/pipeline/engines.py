@@ -0,0 +1,135 @@
+import os
+
+import cv2
+
+_USE_GPU = os.getenv("OCR_USE_GPU", "false").lower() == "true"
+OCR_LANG = "en"
+DEFAULT_OCR_ENGINE = os.getenv("OCR_ENGINE", "paddle")
+# CPU threads per PaddleOCR model (0 keeps Paddle's default). Batch workers
+# lower this to their share of the host.
+OCR_CPU_THREADS = int(os.getenv("OCR_CPU_THREADS", "0"))
+
+_ENGINES = {}
+
+
+class OcrEngine:
+    """Common OCR backend interface.
+
+    `recognize` takes a BGR numpy image and returns a list of lines:
+    {"text": str, "confidence": float (0-1), "box": [[x, y] * 4]}.
+    """
+
+    name = ""
+
+    def recognize(self, img, use_angle_cls: bool, settings: dict) -> list[dict]:
+        raise NotImplementedError
+
+
+class PaddleEngine(OcrEngine):
+    """PaddleOCR det/cls/rec pipeline; one model instance per settings combination.
+
+    Every instance loads the angle classifier so profiles that toggle it per
+    page share one pipeline; ``recognize`` switches it per call via ``cls``.
+    """
+
+    name = "paddle"
+
+    def __init__(self):
+        # Imported lazily so other engines don't pay PaddleOCR's import cost.
+        from paddleocr import PaddleOCR
+
+        self._paddle_cls = PaddleOCR
+        self._instances = {}
+
+    def _get_ocr(self, settings: dict):
+        key = tuple(sorted(settings.items()))
+        if key not in self._instances:
+            if OCR_CPU_THREADS:
+                settings = {"cpu_threads": OCR_CPU_THREADS, **settings}
+            self._instances[key] = self._paddle_cls(
+                use_angle_cls=True,
+                lang=OCR_LANG,
+                use_gpu=_USE_GPU,
+                show_log=False,
+                **settings,
+            )
+        return self._instances[key]
+
+    def recognize(self, img, use_angle_cls: bool, settings: dict) -> list[dict]:
+        ocr = self._get_ocr(settings)
+        result = ocr.ocr(img, cls=use_angle_cls)
+        if not result or not result[0]:
+            return []
+        return [
+            {
+                "text": line[1][0],
+                "confidence": float(line[1][1]),
+                "box": [[float(x), float(y)] for x, y in line[0]],
+            }
+            for line in result[0]
+            if line and line[1]
+        ]
+
+
+class TesseractEngine(OcrEngine):
+    """Tesseract via pytesseract: no model load per worker and a small memory footprint.
+
+    Tesseract has no per-box angle classifier, so `use_angle_cls` is ignored;
+    page orientation is left to its page segmentation mode.
+    """
+
+    name = "tesseract"
+
+    def __init__(self):
+        import pytesseract
+
+        self._tess = pytesseract
+
+    def recognize(self, img, use_angle_cls: bool, settings: dict) -> list[dict]:
+        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        data = self._tess.image_to_data(
+            rgb,
+            lang="eng",
+            config=settings.get("config", ""),
+            output_type=self._tess.Output.DICT,
+        )
+        min_conf = settings.get("min_confidence", 0)
+
+        # Tesseract reports words; group them back into lines.
+        lines = {}
+        for i, word in enumerate(data["text"]):
+            conf = float(data["conf"][i])
+            if not word.strip() or conf < min_conf:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(key, []).append(i)
+
+        results = []
+        for key in sorted(lines):
+            idx = lines[key]
+            x0 = min(data["left"][i] for i in idx)
+            y0 = min(data["top"][i] for i in idx)
+            x1 = max(data["left"][i] + data["width"][i] for i in idx)
+            y1 = max(data["top"][i] + data["height"][i] for i in idx)
+            results.append({
+                "text": " ".join(data["text"][i].strip() for i in idx),
+                "confidence": sum(float(data["conf"][i]) for i in idx) / len(idx) / 100,
+                "box": [[float(x0), float(y0)], [float(x1), float(y0)], [float(x1), float(y1)], [float(x0), float(y1)]],
+            })
+        return results
+
+
+OCR_ENGINES = {
+    PaddleEngine.name: PaddleEngine,
+    TesseractEngine.name: TesseractEngine,
+}
+
+
+def get_engine(name: str | None = None) -> OcrEngine:
+    """Return the shared engine instance for `name` (defaults to OCR_ENGINE)."""
+    name = name or DEFAULT_OCR_ENGINE
+    if name not in OCR_ENGINES:
+        raise ValueError(f"Unknown OCR engine {name!r}; expected one of {sorted(OCR_ENGINES)}")
+    if name not in _ENGINES:
+        _ENGINES[name] = OCR_ENGINES[name]()
+    return _ENGINES[name]
@@ -1,14 +1,126 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import fitz
 
+from src.pipeline.tables import detect_tables, words_from_page
+from src.profiling import record_native
+
 MIN_IMAGE_SIZE_PX = 50
+# Embedded images above this many pixels are not decoded; the rendered page
+# still covers them for QR scanning.
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_EMBEDDED_IMAGE_PIXELS", str(40_000_000)))
+# Below this page count the process pool costs more than it saves.
+PARALLEL_MIN_PAGES = 40
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "0"))
+
+
+def _page_links(page, page_number: int):
+    try:
+        return [link["uri"] for link in page.get_links() if link.get("uri")]
+    except Exception as e:
+        print(f"Annotation link scan failed for page {page_number}: {e}")
+        return []
+
+
+def _page_tables(page, page_number: int):
+    try:
+        return detect_tables(words_from_page(page), page_number)
+    except Exception as e:
+        print(f"Table detection failed for page {page_number}: {e}")
+        return []
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int):
+    """Extract text, image list, links and tables for pages [start, stop).
+
+    Each call opens its own document, so it is safe to run in a worker process.
+    """
+    doc = fitz.open(pdf_path)
+    pages = []
+
+    for i in range(start, stop):
+        page = doc[i]
+        pages.append({
+            "page": i + 1,
+            "content": page.get_text("text"),
+            "images": page.get_images(full=True),
+            "links": _page_links(page, i + 1),
+            "tables": _page_tables(page, i + 1),
+        })
+
+    doc.close()
+    return pages
+
 
-def extract_text(pdf_path: str, include_empty: bool = False):
+def _page_ranges(total_pages: int, parts: int):
+    size, extra = divmod(total_pages, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def extract_pages(pdf_path: str, workers: int | None = None, min_pages: int = PARALLEL_MIN_PAGES):
+    """Extract per-page text, image lists, links and tables, in page order.
+
+    Large documents are split into page ranges handled by separate worker
+    processes; documents under `min_pages` are read serially.
+
+    Args:
+        pdf_path: Path to PDF file
+        workers: Worker process count (defaults to EXTRACT_WORKERS or CPU count)
+        min_pages: Page count below which extraction stays serial
+    """
+    doc = fitz.open(pdf_path)
+    total_pages = len(doc)
+    doc.close()
+
+    workers = workers or EXTRACT_WORKERS or os.cpu_count() or 1
+    workers = min(workers, total_pages)
+    if workers <= 1 or total_pages < min_pages:
+        return _extract_page_range(pdf_path, 0, total_pages)
+
+    ranges = _page_ranges(total_pages, workers)
+    # Spawn keeps workers free of the parent's OCR model and threads.
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=ctx) as pool:
+            results = pool.map(
+                _extract_page_range,
+                [pdf_path] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+            return [page for chunk in results for page in chunk]
+    except (BrokenProcessPool, OSError) as e:
+        # Workers can't start, e.g. when the calling script has no
+        # `if __name__ == "__main__":` guard and spawn re-runs it.
+        print(f"Parallel extraction unavailable, reading serially: {e!r}")
+        return _extract_page_range(pdf_path, 0, total_pages)
+
+
+def extract_text(pdf_path: str, include_empty: bool = False, parallel: bool = False):
     """Extract text from all pages of PDF.
 
     Args:
         pdf_path: Path to PDF file
         include_empty: Include pages with no text content
+        parallel: Use page-range worker processes for large documents
     """
+    if parallel:
+        return [
+            {"page": p["page"], "content": p["content"]}
+            for p in extract_pages(pdf_path)
+            if include_empty or p["content"].strip()
+        ]
+
     doc = fitz.open(pdf_path)
     pages = []
 
@@ -24,38 +136,51 @@ def extract_text(pdf_path: str, include_empty: bool = False):
     return pages
 
 
+def extract_page_images(doc, page, page_number: int):
+    """Extract images from one page of an open document."""
+    images = []
+    image_list = page.get_images(full=True)
+
+    for img_index, img in enumerate(image_list):
+        xref = img[0]
+        width, height = img[2], img[3]
+        if width * height > MAX_IMAGE_PIXELS:
+            print(f"Skipping {width}x{height} image {img_index} on page {page_number}: over MAX_EMBEDDED_IMAGE_PIXELS")
+            continue
+        
+        try:
+            # Extract the image
+            base_image = doc.extract_image(xref)
+            image_bytes = base_image["image"]
+            
+            # Create pixmap from bytes
+            pix = fitz.Pixmap(image_bytes)
+            
+            # Convert CMYK to RGB if needed.
+            if pix.colorspace and pix.colorspace.name not in ("DeviceRGB", "DeviceGray"):
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            record_native("embedded image pixmap", pix.stride * pix.height)
+            
+            # Skip very small images (likely icons or decorations).
+            if pix.width > MIN_IMAGE_SIZE_PX and pix.height > MIN_IMAGE_SIZE_PX:
+                images.append({
+                    "page": page_number,
+                    "pixmap": pix
+                })
+        except Exception as e:
+            print(f"Warning: Could not extract image {img_index} from page {page_number}: {e}")
+            continue
+
+    return images
+
+
 def extract_images(pdf_path: str):
     """Extract images from all pages of PDF."""
     doc = fitz.open(pdf_path)
     images = []
 
     for page_index, page in enumerate(doc):
-        image_list = page.get_images(full=True)
-        
-        for img_index, img in enumerate(image_list):
-            xref = img[0]
-            
-            try:
-                # Extract the image
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                
-                # Create pixmap from bytes
-                pix = fitz.Pixmap(image_bytes)
-                
-                # Convert CMYK to RGB if needed.
-                if pix.colorspace and pix.colorspace.name not in ("DeviceRGB", "DeviceGray"):
-                    pix = fitz.Pixmap(fitz.csRGB, pix)
-                
-                # Skip very small images (likely icons or decorations).
-                if pix.width > MIN_IMAGE_SIZE_PX and pix.height > MIN_IMAGE_SIZE_PX:
-                    images.append({
-                        "page": page_index + 1,
-                        "pixmap": pix
-                    })
-            except Exception as e:
-                print(f"Warning: Could not extract image {img_index} from page {page_index + 1}: {e}")
-                continue
+        images.extend(extract_page_images(doc, page, page_index + 1))
     
     doc.close()
     return images
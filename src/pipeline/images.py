@@ -0,0 +1,102 @@
+import cv2
+import numpy as np
+
+# Image brochures are downscaled on load; OCR and QR never need more than this.
+IMAGE_MAX_DIMENSION = 3000
+
+_SIGNATURES = (
+    (b"%PDF", "pdf"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+)
+
+
+def sniff_type(path: str) -> str | None:
+    """Detect the file type from its leading bytes, ignoring the extension.
+
+    Returns:
+        "pdf", "png", "jpeg", "webp", "tiff" or None when unknown
+    """
+    with open(path, "rb") as f:
+        head = f.read(16)
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    for signature, kind in _SIGNATURES:
+        if head.startswith(signature):
+            return kind
+    # Some generators put junk before the PDF header.
+    if b"%PDF" in head:
+        return "pdf"
+    return None
+
+
+def downscale_image(img, max_dimension: int):
+    """Shrink `img` so its longest side is at most `max_dimension`."""
+    h, w = img.shape[:2]
+    if max(h, w) <= max_dimension:
+        return img
+    scale = max_dimension / max(h, w)
+    return cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def _to_bgr(img):
+    """Convert a decoded frame of any depth/channel layout to 8-bit BGR.
+
+    Transparent areas are composited onto white, the way the brochure would
+    look printed, instead of whatever colour the encoder left under them.
+    """
+    if img.dtype == np.uint16:
+        img = (img >> 8).astype(np.uint8)
+    elif img.dtype != np.uint8:
+        img = cv2.normalize(img, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+    if img.shape[2] == 4:
+        alpha = img[:, :, 3:].astype(np.float32) / 255
+        return (img[:, :, :3] * alpha + 255 * (1 - alpha)).astype(np.uint8)
+    return img
+
+
+def image_page_count(path: str) -> int:
+    """Number of pages in an image brochure (TIFF frames; 1 for anything else)."""
+    if sniff_type(path) == "tiff":
+        return cv2.imcount(str(path))
+    return 1
+
+
+def iter_image_pages(path: str, max_dimension: int = IMAGE_MAX_DIMENSION):
+    """Decode an image brochure into (frame index, BGR page array) pairs, one frame at a time.
+
+    Frames that fail to decode are skipped, so callers number pages by the
+    frame index rather than by counting. Multi-page TIFFs are read frame by frame so only one full-resolution
+    frame is in memory at once. JPEGs are decoded as colour so their EXIF
+    orientation is applied; other formats keep their alpha channel until it
+    is composited onto white.
+    """
+    kind = sniff_type(path)
+    decoded = 0
+    if kind == "tiff":
+        for start in range(cv2.imcount(str(path))):
+            ok, frames = cv2.imreadmulti(str(path), start, 1, flags=cv2.IMREAD_UNCHANGED)
+            if not ok or not frames:
+                print(f"Could not decode frame {start + 1} of {path}")
+                continue
+            # Only the downscaled page stays alive while the caller works on it.
+            page = _to_bgr(downscale_image(frames[0], max_dimension))
+            del frames
+            decoded += 1
+            yield start, page
+    else:
+        data = np.fromfile(str(path), dtype=np.uint8)
+        img = cv2.imdecode(data, cv2.IMREAD_COLOR if kind == "jpeg" else cv2.IMREAD_UNCHANGED)
+        del data
+        if img is not None:
+            page = _to_bgr(downscale_image(img, max_dimension))
+            del img
+            decoded += 1
+            yield 0, page
+
+    if not decoded:
+        raise ValueError(f"Could not decode image brochure: {path}")
@@ -1,22 +1,173 @@
 import cv2
+import hashlib
+import json
 import numpy as np
 import os
-from paddleocr import PaddleOCR
+from pathlib import Path
 
-_OCR_INSTANCES = {}
-_USE_GPU = os.getenv("OCR_USE_GPU", "false").lower() == "true"
+from src.pipeline.engines import OCR_LANG, get_engine
+from src.profiling import checkpoint
 
+_CACHE_ENABLED = os.getenv("OCR_CACHE", "true").lower() == "true"
+_CACHE_DIR = os.getenv("OCR_CACHE_DIR", os.path.join("data", "cache", "ocr"))
+_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "5000"))
 
-def _get_ocr(use_angle_cls: bool):
-    key = "angle" if use_angle_cls else "no_angle"
-    if key not in _OCR_INSTANCES:
-        _OCR_INSTANCES[key] = PaddleOCR(
-            use_angle_cls=use_angle_cls,
-            lang="en",
-            use_gpu=_USE_GPU,
-            show_log=False,
-        )
-    return _OCR_INSTANCES[key]
+# Speed/accuracy presets. "angle_cls" is always / auto (page orientation check) / never;
+# the remaining keys hold per-engine settings (see src/pipeline/engines.py).
+OCR_PROFILES = {
+    "fast": {
+        "angle_cls": "never",
+        "paddle": {
+            "det_limit_side_len": 736,
+            "det_limit_type": "max",
+            "rec_batch_num": 16,
+            "det_db_box_thresh": 0.6,
+            "drop_score": 0.6,
+        },
+        "tesseract": {"config": "--oem 1 --psm 6", "min_confidence": 60},
+    },
+    "balanced": {
+        "angle_cls": "auto",
+        "paddle": {
+            "det_limit_side_len": 960,
+            "det_limit_type": "max",
+            "rec_batch_num": 8,
+            "det_db_box_thresh": 0.6,
+            "drop_score": 0.5,
+        },
+        "tesseract": {"config": "--oem 1 --psm 3", "min_confidence": 40},
+    },
+    "accurate": {
+        "angle_cls": "always",
+        "paddle": {
+            "det_limit_side_len": 1920,
+            "det_limit_type": "max",
+            "rec_batch_num": 6,
+            "det_db_box_thresh": 0.5,
+            "drop_score": 0.5,
+        },
+        "tesseract": {"config": "--oem 1 --psm 3", "min_confidence": 0},
+    },
+}
+DEFAULT_OCR_PROFILE = os.getenv("OCR_PROFILE", "balanced")
+ORIENTATION_SAMPLE_PX = 512
+# Rows must vary this much more than columns for a page to count as upright.
+ORIENTATION_MARGIN = 1.5
+
+
+class OcrCache:
+    """On-disk OCR memo keyed by raster hash + OCR settings, with LRU eviction.
+
+    Entries are JSON files; a hit touches the file so mtime tracks recency.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = _CACHE_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._count = None
+
+    @staticmethod
+    def make_key(img, settings: dict) -> str:
+        h = hashlib.sha256()
+        h.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        h.update(str(img.shape).encode("utf-8"))
+        h.update(np.ascontiguousarray(img).data)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                lines = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return lines
+
+    def put(self, key: str, lines: list[dict]):
+        """Store `lines`; best-effort, a failed write only loses the memo."""
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(lines, f, ensure_ascii=False)
+            existed = path.exists()
+            count = self._entry_count()
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"OCR cache write failed: {e}")
+            try:
+                tmp.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+        if not existed:
+            self._count = count + 1
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _entries(self):
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def _entry_count(self) -> int:
+        if self._count is None:
+            self._count = len(self._entries())
+        return self._count
+
+    def _evict(self):
+        # Drop the least recently used tenth so eviction does not run on every put.
+        # Other processes share the directory, so entries may vanish under us.
+        entries = []
+        try:
+            paths = self._entries()
+        except OSError as e:
+            print(f"OCR cache eviction failed: {e}")
+            return
+        for path in paths:
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        entries.sort(key=lambda entry: entry[0])
+        target = int(self.max_entries * 0.9)
+        for _, path in entries[: max(0, len(entries) - target)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._count = None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3)}
+
+
+_OCR_CACHE = OcrCache(_CACHE_DIR) if _CACHE_ENABLED else None
+
+
+def ocr_cache_stats():
+    """Hit/miss counters for the OCR cache, or None when caching is disabled."""
+    return _OCR_CACHE.stats() if _OCR_CACHE else None
+
+
+def get_ocr_profile(name: str | None = None) -> tuple[str, dict]:
+    """Resolve a profile name (defaults to OCR_PROFILE) to its settings."""
+    name = name or DEFAULT_OCR_PROFILE
+    if name not in OCR_PROFILES:
+        raise ValueError(f"Unknown OCR profile {name!r}; expected one of {sorted(OCR_PROFILES)}")
+    return name, OCR_PROFILES[name]
 
 
 def _to_bgr(pixmap):
@@ -47,16 +198,126 @@ def _resize_for_ocr(img, source_type: str, embedded_max_dimension: int = 3000):
     return cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA)
 
 
-def ocr_pixmap(pixmap, source_type: str = "embedded", use_angle_cls: bool = True):
-    """Extract text from a fitz.Pixmap with safer speed optimizations."""
-    if pixmap.width < 20 or pixmap.height < 20:
-        return ""
+def _needs_angle_cls(img) -> bool:
+    """Cheap orientation check on a downscaled copy of the page.
 
-    img = _to_bgr(pixmap)
+    Upright text gives a row ink profile that varies far more than the column
+    profile; sideways pages flip that. Upside-down pages are not detected, so
+    use the "accurate" profile for sources where those are expected.
+    """
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape[:2]
+    scale = ORIENTATION_SAMPLE_PX / max(h, w)
+    if scale < 1:
+        gray = cv2.resize(
+            gray, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA
+        )
+    _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    if not ink.any():
+        return False
+    row_var = ink.mean(axis=1).var()
+    col_var = ink.mean(axis=0).var()
+    return row_var < col_var * ORIENTATION_MARGIN
+
+
+def _resolve_angle_cls(img, mode: str, use_angle_cls: bool | None) -> bool:
+    if use_angle_cls is not None:
+        return use_angle_cls
+    if mode == "always":
+        return True
+    if mode == "never":
+        return False
+    return _needs_angle_cls(img)
+
+
+def _run_ocr(img, use_angle_cls: bool, settings: dict, engine):
+    return engine.recognize(img, use_angle_cls, settings.get(engine.name, {}))
+
+
+def ocr_image_lines(
+    img,
+    source_type: str = "embedded",
+    use_angle_cls: bool | None = None,
+    profile: str | None = None,
+    engine: str | None = None,
+    use_cache: bool = True,
+):
+    """OCR a BGR numpy image and return text lines with boxes and confidences.
+
+    Results are memoized on disk by raster hash, so repeated backgrounds and
+    banners across brochures are only OCRed once.
+
+    Args:
+        img: BGR image (H x W x 3, uint8)
+        source_type: "rendered" page or "embedded" image
+        use_angle_cls: Force angle classification on/off; None lets the profile decide
+        profile: OCR profile name (fast / balanced / accurate)
+        engine: OCR engine name (defaults to OCR_ENGINE)
+        use_cache: Read/write the on-disk OCR cache
+    """
+    h, w = img.shape[:2]
+    if w < 20 or h < 20:
+        return []
+
+    profile, settings = get_ocr_profile(profile)
+    ocr_engine = get_engine(engine)
     img = _resize_for_ocr(img, source_type=source_type)
-    ocr = _get_ocr(use_angle_cls=use_angle_cls)
-    result = ocr.ocr(img, cls=use_angle_cls)
-    if not result or not result[0]:
-        return ""
-    text_lines = [line[1][0] for line in result[0] if line and line[1]]
-    return "\n".join(text_lines)
+    # Raster buffers are alive here; let the profiler record the high-water mark.
+    checkpoint()
+    use_angle_cls = _resolve_angle_cls(img, settings["angle_cls"], use_angle_cls)
+    if _OCR_CACHE is None or not use_cache:
+        return _run_ocr(img, use_angle_cls, settings, ocr_engine)
+
+    cache_settings = {
+        "lang": OCR_LANG,
+        "engine": ocr_engine.name,
+        "use_angle_cls": use_angle_cls,
+        "source_type": source_type,
+        "engine_settings": settings.get(ocr_engine.name, {}),
+    }
+    key = _OCR_CACHE.make_key(img, cache_settings)
+    lines = _OCR_CACHE.get(key)
+    if lines is None:
+        lines = _run_ocr(img, use_angle_cls, settings, ocr_engine)
+        _OCR_CACHE.put(key, lines)
+    return lines
+
+
+def ocr_pixmap_lines(
+    pixmap,
+    source_type: str = "embedded",
+    use_angle_cls: bool | None = None,
+    profile: str | None = None,
+    engine: str | None = None,
+    use_cache: bool = True,
+):
+    """OCR a fitz.Pixmap; see `ocr_image_lines`."""
+    if pixmap.width < 20 or pixmap.height < 20:
+        return []
+
+    return ocr_image_lines(
+        _to_bgr(pixmap),
+        source_type=source_type,
+        use_angle_cls=use_angle_cls,
+        profile=profile,
+        engine=engine,
+        use_cache=use_cache,
+    )
+
+
+def ocr_pixmap(
+    pixmap,
+    source_type: str = "embedded",
+    use_angle_cls: bool | None = None,
+    profile: str | None = None,
+    engine: str | None = None,
+):
+    """Extract text from a fitz.Pixmap with safer speed optimizations."""
+    lines = ocr_pixmap_lines(
+        pixmap,
+        source_type=source_type,
+        use_angle_cls=use_angle_cls,
+        profile=profile,
+        engine=engine,
+    )
+    return "\n".join(line["text"] for line in lines)
@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
 
+from src.profiling import checkpoint
+
 
 def _decode_qr_from_bgr(image_bgr):
     """Decode QR codes from a BGR image.
@@ -43,4 +45,15 @@ def decode_qr_from_pixmap(pixmap):
         # Fallback for uncommon channel formats (e.g., CMYK); keep first 3 channels.
         img = img[:, :, :3]
 
+    checkpoint()
     return _decode_qr_from_bgr(img)
+
+
+def decode_qr_from_image(image_bgr):
+    """Decode QR codes from a BGR numpy image."""
+    h, w = image_bgr.shape[:2]
+    if w < 24 or h < 24:
+        return []
+
+    checkpoint()
+    return _decode_qr_from_bgr(image_bgr)
@@ -0,0 +1,202 @@
+import re
+from statistics import median
+
+TABLES_SECTION = "=== TABLES ==="
+
+MIN_TABLE_ROWS = 2
+MIN_TABLE_COLUMNS = 2
+# Thresholds below are in units of the median word height, so they work for
+# PDF points and OCR pixel boxes alike.
+ROW_TOLERANCE = 0.5
+CELL_GAP = 1.2
+COLUMN_TOLERANCE = 1.5
+MAX_ROW_GAP = 3.0
+TITLE_GAP = 2.0
+# Table cells are short labels and values; two-column prose has long cells
+# and few numbers.
+MAX_SHORT_CELL_WORDS = 4
+MIN_SHORT_CELL_RATIO = 0.6
+MIN_NUMERIC_ROW_RATIO = 0.5
+NUMERIC_CELL = re.compile(r"\d|₹", re.I)
+
+TABLE_KINDS = {
+    "prize": re.compile(
+        r"\bPRIZES?\b|\bRANK\b|\bCASH\b|\bTROPHY\b|\bTROPHIES\b|\bCERTIFICATE\b|\bMEDAL\b|₹|\bRS\b\.?|\bINR\b",
+        re.I,
+    ),
+    "schedule": re.compile(
+        r"\bROUNDS?\b|\bSCHEDULE\b|\bREPORTING\b|\bCEREMONY\b|\b\d{1,2}[:.]\d{2}\s*(?:AM|PM)\b",
+        re.I,
+    ),
+    "entry_fee": re.compile(r"\bENTRY\b|\bFEES?\b|\bREGISTRATION\b", re.I),
+}
+
+
+def words_from_page(page):
+    """Word boxes (x0, y0, x1, y1, text) from a fitz page's text layer."""
+    return [(w[0], w[1], w[2], w[3], w[4]) for w in page.get_text("words") if w[4].strip()]
+
+
+def words_from_ocr_lines(lines: list[dict]):
+    """Word boxes from OCR lines (each OCR box becomes one word)."""
+    words = []
+    for line in lines:
+        xs = [p[0] for p in line["box"]]
+        ys = [p[1] for p in line["box"]]
+        if line["text"].strip():
+            words.append((min(xs), min(ys), max(xs), max(ys), line["text"]))
+    return words
+
+
+def _group_rows(words, height: float):
+    rows = []
+    for word in sorted(words, key=lambda w: (w[1] + w[3]) / 2):
+        center = (word[1] + word[3]) / 2
+        if rows and abs(center - rows[-1]["center"]) <= ROW_TOLERANCE * height:
+            row = rows[-1]
+            row["words"].append(word)
+            row["center"] += (center - row["center"]) / len(row["words"])
+        else:
+            rows.append({"center": center, "words": [word]})
+    return rows
+
+
+def _row_cells(row_words, height: float):
+    """Merge words on one row into cells separated by wide gaps."""
+    cells = []
+    for word in sorted(row_words, key=lambda w: w[0]):
+        if cells and word[0] - cells[-1]["x1"] <= CELL_GAP * height:
+            cells[-1]["text"] += " " + word[4]
+            cells[-1]["x1"] = max(cells[-1]["x1"], word[2])
+        else:
+            cells.append({"x0": word[0], "x1": word[2], "text": word[4]})
+    return cells
+
+
+def _column_anchors(rows, height: float):
+    anchors = []
+    for x0 in sorted(cell["x0"] for row in rows for cell in row["cells"]):
+        if anchors and x0 - anchors[-1][-1] <= COLUMN_TOLERANCE * height:
+            anchors[-1].append(x0)
+        else:
+            anchors.append([x0])
+    return [sum(a) / len(a) for a in anchors]
+
+
+def _title_above(rows, i: int, height: float):
+    """Text of a single-cell row directly above row `i`, used as the table title."""
+    if i == 0 or len(rows[i - 1]["cells"]) != 1:
+        return None
+    if rows[i]["center"] - rows[i - 1]["center"] > TITLE_GAP * height:
+        return None
+    return rows[i - 1]["cells"][0]["text"]
+
+
+def _looks_tabular(grid) -> bool:
+    """Most cells are short, and enough rows have a short numeric/amount cell."""
+    cells = [value for values in grid for value in values if value]
+    short = [value for value in cells if len(value.split()) <= MAX_SHORT_CELL_WORDS]
+    if len(short) < MIN_SHORT_CELL_RATIO * len(cells):
+        return False
+    numeric_rows = sum(
+        1
+        for values in grid
+        if any(value and len(value.split()) <= MAX_SHORT_CELL_WORDS and NUMERIC_CELL.search(value) for value in values)
+    )
+    return numeric_rows >= max(MIN_TABLE_ROWS, MIN_NUMERIC_ROW_RATIO * len(grid))
+
+
+def _classify(text: str):
+    scores = {kind: len(pattern.findall(text)) for kind, pattern in TABLE_KINDS.items()}
+    kind = max(scores, key=scores.get)
+    return kind if scores[kind] else None
+
+
+def _build_table(rows, title: str | None, height: float, page_number: int):
+    anchors = _column_anchors(rows, height)
+    if len(anchors) < MIN_TABLE_COLUMNS:
+        return None
+
+    grid = []
+    for row in rows:
+        values = [""] * len(anchors)
+        for cell in row["cells"]:
+            col = min(range(len(anchors)), key=lambda i: abs(anchors[i] - cell["x0"]))
+            values[col] = f"{values[col]} {cell['text']}".strip()
+        while values and not values[-1]:
+            values.pop()
+        grid.append(values)
+
+    if not _looks_tabular(grid):
+        return None
+    text = " ".join([title or ""] + [v for values in grid for v in values])
+    kind = _classify(text)
+    if kind is None:
+        return None
+    return {"page": page_number, "kind": kind, "title": title, "rows": grid}
+
+
+def detect_tables(words, page_number: int):
+    """Rebuild prize / schedule / entry-fee tables from positioned words.
+
+    Consecutive rows with at least MIN_TABLE_COLUMNS cells form a table; cells
+    are snapped to columns by their left edges. Runs that read like prose
+    (long cells, few numbers) and tables that match none of TABLE_KINDS are
+    dropped.
+
+    Returns:
+        List of {"page", "kind", "title", "rows"} records, rows as lists of cells
+    """
+    if not words:
+        return []
+
+    height = median(w[3] - w[1] for w in words) or 1.0
+    rows = _group_rows(words, height)
+    for row in rows:
+        row["cells"] = _row_cells(row["words"], height)
+
+    tables = []
+    run = []
+    title = None
+
+    def close_run():
+        if len(run) >= MIN_TABLE_ROWS:
+            table = _build_table(run, title, height, page_number)
+            if table:
+                tables.append(table)
+
+    for i, row in enumerate(rows):
+        gap = row["center"] - rows[i - 1]["center"] if i else 0
+        is_table_row = len(row["cells"]) >= MIN_TABLE_COLUMNS
+        if is_table_row and run and gap <= MAX_ROW_GAP * height:
+            run.append(row)
+            continue
+        close_run()
+        run = [row] if is_table_row else []
+        title = _title_above(rows, i, height) if is_table_row else None
+    close_run()
+
+    return tables
+
+
+def table_kinds(content: str) -> set[str]:
+    """Kinds of the tables listed in `content`'s TABLES section (empty if none)."""
+    _, found, section = content.partition(TABLES_SECTION)
+    if not found:
+        return set()
+    return set(re.findall(r"^\[(\w+) table, page \d+\]", section, re.M))
+
+
+def format_tables(tables: list[dict]) -> str:
+    """Render tables as a compact row-wise text section (empty if none)."""
+    if not tables:
+        return ""
+
+    blocks = []
+    for table in tables:
+        heading = f"[{table['kind']} table, page {table['page']}]"
+        if table["title"]:
+            heading += f" {table['title']}"
+        lines = [heading] + [" | ".join(values) for values in table["rows"]]
+        blocks.append("\n".join(lines))
+    return f"\n\n{TABLES_SECTION}\n\n" + "\n\n".join(blocks)
@@ -0,0 +1,187 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_ENABLED = os.getenv("PDF_PROFILE", "false").lower() == "true"
+TOP_N = 15
+TRACEBACK_FRAMES = 10
+
+_ACTIVE = None
+# Whether start_profiling turned tracemalloc on (and so may turn it off).
+_STARTED_TRACING = False
+
+
+class StageProfiler:
+    """cProfile + tracemalloc figures for each pipeline stage.
+
+    Stages may be entered many times (once per page); timings and profiles
+    accumulate and the memory peak is the highest seen in any single entry.
+    Work a stage hands to another thread is profiled separately (see
+    `profile_call`) and merged into the stage's top functions.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._active_stage = None
+        self._stage_thread = None
+
+    def _stage(self, name: str):
+        if name not in self.stages:
+            self.stages[name] = {
+                "profile": cProfile.Profile(),
+                "thread_profiles": [],
+                "seconds": 0.0,
+                "calls": 0,
+                "peak": 0,
+                "snapshot": None,
+                "snapshot_size": 0,
+                "native": {},
+            }
+        return self.stages[name]
+
+    @contextmanager
+    def stage(self, name: str):
+        st = self._stage(name)
+        self._active_stage = name
+        self._stage_thread = threading.get_ident()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        st["profile"].enable()
+        try:
+            yield
+        finally:
+            st["profile"].disable()
+            st["seconds"] += time.perf_counter() - started
+            st["calls"] += 1
+            st["peak"] = max(st["peak"], tracemalloc.get_traced_memory()[1] - base)
+            self._active_stage = None
+
+    def profile_call(self, name: str, func, *args, **kwargs):
+        """Run `func` on the calling thread under its own profiler, credited to stage `name`."""
+        if threading.get_ident() == self._stage_thread:
+            # Already covered by the stage profiler; a second one would replace it.
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler, and it already sees every thread.
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            self.stages[name]["thread_profiles"].append(profiler)
+
+    def checkpoint(self):
+        """Snapshot allocations if traced memory is at a new high for the stage."""
+        if self._active_stage is None:
+            return
+        st = self.stages[self._active_stage]
+        current = tracemalloc.get_traced_memory()[0]
+        if current > st["snapshot_size"]:
+            st["snapshot"] = tracemalloc.take_snapshot()
+            st["snapshot_size"] = current
+
+    def record_native(self, label: str, nbytes: int):
+        """Count a buffer allocated outside Python (e.g. MuPDF pixmaps)."""
+        if self._active_stage is None:
+            return
+        native = self.stages[self._active_stage]["native"]
+        count, largest, total = native.get(label, (0, 0, 0))
+        native[label] = (count + 1, max(largest, nbytes), total + nbytes)
+
+    def report(self) -> str:
+        mb = 1024 * 1024
+        lines = ["Pipeline profile", ""]
+        for name, st in self.stages.items():
+            lines.append(f"=== {name} ===")
+            lines.append(
+                f"time {st['seconds']:.2f}s over {st['calls']} entries, "
+                f"traced peak {st['peak'] / mb:.1f} MB"
+            )
+            for label, (count, largest, total) in st["native"].items():
+                lines.append(
+                    f"native {label}: {count} buffers, largest {largest / mb:.1f} MB, total {total / mb:.1f} MB"
+                )
+
+            out = io.StringIO()
+            stats = pstats.Stats(st["profile"], stream=out)
+            for profiler in list(st["thread_profiles"]):
+                stats.add(profiler)
+            stats.sort_stats("cumulative").print_stats(TOP_N)
+            lines.append("")
+            lines.append("Top functions (cumulative):")
+            lines.extend(ln for ln in out.getvalue().splitlines() if ln.strip())
+
+            if st["snapshot"] is not None:
+                lines.append("")
+                lines.append(f"Top allocation sites at stage high-water mark ({st['snapshot_size'] / mb:.1f} MB):")
+                for stat in st["snapshot"].statistics("lineno")[:TOP_N]:
+                    lines.append(f"  {stat.size / mb:8.2f} MB  {stat.count:6d} blocks  {stat.traceback[0]}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def write(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.report(), encoding="utf-8")
+        print(f"Wrote profile report to {path}")
+
+
+def start_profiling() -> StageProfiler:
+    global _ACTIVE, _STARTED_TRACING
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEBACK_FRAMES)
+        _STARTED_TRACING = True
+    _ACTIVE = StageProfiler()
+    return _ACTIVE
+
+
+def stop_profiling():
+    """Stop stage profiling; tracing started elsewhere (e.g. -X tracemalloc) is left on."""
+    global _ACTIVE, _STARTED_TRACING
+    _ACTIVE = None
+    if _STARTED_TRACING:
+        tracemalloc.stop()
+        _STARTED_TRACING = False
+
+
+@contextmanager
+def profile_stage(name: str):
+    """Profile the block as stage `name` when profiling is active; no-op otherwise."""
+    if _ACTIVE is None:
+        yield
+        return
+    with _ACTIVE.stage(name):
+        yield
+
+
+def profiled(func):
+    """Wrap `func` so a call on another thread is profiled under the current stage.
+
+    cProfile (before 3.12) only sees the thread that enabled it, so work handed
+    to `run_with_timeout`'s worker thread would otherwise show up as a queue wait.
+    """
+    if _ACTIVE is None or _ACTIVE._active_stage is None:
+        return func
+    profiler, name = _ACTIVE, _ACTIVE._active_stage
+    return functools.partial(profiler.profile_call, name, func)
+
+
+def checkpoint():
+    if _ACTIVE is not None:
+        _ACTIVE.checkpoint()
+
+
+def record_native(label: str, nbytes: int):
+    if _ACTIVE is not None:
+        _ACTIVE.record_native(label, nbytes)
@@ -0,0 +1,203 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+BATCH_MAX_ITEMS = 50
+BATCH_MAX_WAIT_SECONDS = 30.0
+BATCH_RETRIES = 3
+BATCH_RETRY_BACKOFF_SECONDS = 2.0
+
+
+class ResultSink:
+    """Destination for finished analyses. `add` may buffer; `flush`/`close` send
+    the buffer and raise if it could not be delivered."""
+
+    def add(self, event_id, analysis):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def pending(self) -> int:
+        """Number of analyses accepted by `add` but not yet delivered."""
+        return 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PostSink(ResultSink):
+    """One uncompressed POST to /api/analysis per event, sent immediately."""
+
+    def __init__(self, base_url: str):
+        self.url = f"{base_url.rstrip('/')}/api/analysis"
+
+    def add(self, event_id, analysis):
+        response = requests.post(
+            self.url,
+            json={"eventId": event_id, "Analysis": analysis},
+            timeout=60,
+        )
+        response.raise_for_status()
+
+
+class _BufferedSink(ResultSink):
+    """Buffers analyses by eventId and flushes by count or age.
+
+    A later analysis for the same eventId replaces the buffered one, so a
+    batch never holds duplicates. When a count-triggered flush fails, `add`
+    does not raise: the batch stays buffered, count flushes pause for
+    `max_wait`, and the timer (or the caller's `flush`) retries it.
+
+    Uploads run outside the buffer lock, so a slow or retrying upload never
+    blocks `add`; one upload runs at a time, keeping batches in order.
+    """
+
+    def __init__(self, max_items: int = BATCH_MAX_ITEMS, max_wait: float = BATCH_MAX_WAIT_SECONDS):
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self._buffer = {}
+        self._lock = threading.Lock()
+        self._upload_lock = threading.Lock()
+        self._timer = None
+        self._hold_until = 0.0
+
+    def _write_batch(self, items: list[dict]):
+        raise NotImplementedError
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def _start_timer(self):
+        if self._timer is None and self.max_wait:
+            self._timer = threading.Timer(self.max_wait, self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def add(self, event_id, analysis):
+        with self._lock:
+            self._buffer[str(event_id)] = {"eventId": event_id, "Analysis": analysis}
+            if len(self._buffer) < self.max_items or time.monotonic() < self._hold_until:
+                self._start_timer()
+                return
+        try:
+            self._flush(wait=False)
+        except Exception as e:
+            # The analysis is safely buffered; delivery is retried later.
+            with self._lock:
+                print(f"[sink] Flush failed, keeping {len(self._buffer)} analyses buffered: {e}")
+                self._hold_until = time.monotonic() + self.max_wait
+                self._start_timer()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"[sink] Timed flush failed, will retry on next flush: {e}")
+
+    def flush(self):
+        self._flush(wait=True)
+
+    def _flush(self, wait: bool):
+        # With wait=False (count-triggered from `add`) an upload already in
+        # progress is left alone and the timer sends what is left.
+        if not self._upload_lock.acquire(blocking=wait):
+            with self._lock:
+                self._start_timer()
+            return
+        try:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._buffer:
+                    return
+                items = list(self._buffer.values())
+                self._buffer = {}
+            try:
+                self._write_batch(items)
+            except Exception:
+                # Put the batch back unless newer results arrived for those events.
+                with self._lock:
+                    for item in items:
+                        self._buffer.setdefault(str(item["eventId"]), item)
+                raise
+        finally:
+            self._upload_lock.release()
+
+
+class BatchHttpSink(_BufferedSink):
+    """Gzipped batch POSTs to /api/analysis/batch with idempotent retries.
+
+    Each batch carries an Idempotency-Key derived from its contents, so a retry
+    of a batch the backend already applied is safe to replay.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_items: int = BATCH_MAX_ITEMS,
+        max_wait: float = BATCH_MAX_WAIT_SECONDS,
+        retries: int = BATCH_RETRIES,
+    ):
+        super().__init__(max_items=max_items, max_wait=max_wait)
+        self.url = f"{base_url.rstrip('/')}/api/analysis/batch"
+        self.retries = retries
+
+    @staticmethod
+    def _idempotency_key(items: list[dict]) -> str:
+        # Hash the whole batch (ids and analyses), so only a true replay shares
+        # a key; re-running a backfill with new analyses gets a new one.
+        items = sorted(items, key=lambda item: str(item["eventId"]))
+        body = json.dumps(items, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    def _write_batch(self, items: list[dict]):
+        body = gzip.compress(json.dumps({"items": items}, ensure_ascii=False).encode("utf-8"))
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+            "Idempotency-Key": self._idempotency_key(items),
+        }
+        for attempt in range(self.retries + 1):
+            try:
+                response = requests.post(self.url, data=body, headers=headers, timeout=60)
+                if response.status_code < 500 and response.status_code != 429:
+                    response.raise_for_status()
+                    print(f"[sink] Uploaded {len(items)} analyses ({len(body)} bytes gzipped)")
+                    return
+                error = requests.HTTPError(f"{response.status_code} from {self.url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt < self.retries:
+                time.sleep(BATCH_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+        raise error
+
+
+class FileSink(_BufferedSink):
+    """Appends batches to a gzipped JSON Lines file for offline runs."""
+
+    def __init__(self, path: str | Path, max_items: int = BATCH_MAX_ITEMS, max_wait: float = BATCH_MAX_WAIT_SECONDS):
+        super().__init__(max_items=max_items, max_wait=max_wait)
+        self.path = Path(path)
+
+    def _write_batch(self, items: list[dict]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        print(f"[sink] Wrote {len(items)} analyses to {self.path}")
@@ -0,0 +1,23 @@
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Tests import `src` and `scripts` from the repository root.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.stub_events_server import StubState, _generate_events, make_handler  # noqa: E402
+
+
+@pytest.fixture
+def stub_api():
+    """Events API stub with 30 synthetic events; yields (state, base_url)."""
+    state = StubState(_generate_events(30, "http://127.0.0.1/brochures/x.pdf"), None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield state, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,47 @@
+from concurrent.futures import Future
+
+from src.batch import _Document, _Scheduler, process_pdfs
+from src.main import process_pdf
+
+SAMPLE_PDF = "data/input/sample2.pdf"
+
+
+class HeldPool:
+    """Pool stand-in whose futures never finish, to inspect what gets started."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, func, *args):
+        self.submitted.append((func.__name__, args))
+        return Future()
+
+
+def _unit(name):
+    def func(*args):
+        pass
+
+    func.__name__ = name
+    return func
+
+
+def test_raster_free_units_start_while_a_raster_unit_waits():
+    pool = HeldPool()
+    scheduler = _Scheduler(pool, workers=4, raster_budget=100, ocr_profile="fast")
+    doc = _Document(0, SAMPLE_PDF)
+    scheduler.push(doc, "ocr", _unit("running_ocr"), (SAMPLE_PDF, 0), raster=80)
+    scheduler.start_ready()
+    scheduler.push(doc, "ocr", _unit("big_ocr"), (SAMPLE_PDF, 1), raster=50)
+    scheduler.push(doc, "qr", _unit("small_qr"), (SAMPLE_PDF, 1), raster=10)
+    scheduler.push(doc, "text", _unit("text"), (SAMPLE_PDF, 0, 1))
+    scheduler.start_ready()
+
+    assert [name for name, _ in pool.submitted] == ["running_ocr", "text"]
+    assert len(scheduler.queue) == 2
+
+
+def test_batch_matches_single_document_processing():
+    results = dict(process_pdfs([SAMPLE_PDF, SAMPLE_PDF + ".missing"], workers=2))
+    assert results[SAMPLE_PDF]["error"] is None
+    assert results[SAMPLE_PDF]["chunks"] == process_pdf(SAMPLE_PDF)
+    assert results[SAMPLE_PDF + ".missing"]["error"]
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from src.pipeline import budget
+from src.pipeline.budget import abandoned_calls, run_with_timeout
+
+
+def test_stuck_calls_are_capped(monkeypatch):
+    monkeypatch.setattr(budget, "MAX_ABANDONED_CALLS", 2)
+    release = threading.Event()
+    started = []
+
+    def stuck():
+        started.append(1)
+        release.wait()
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError, match="timed out"):
+            run_with_timeout(stuck, 0.05)
+    assert abandoned_calls() == 2
+
+    with pytest.raises(TimeoutError, match="still running"):
+        run_with_timeout(stuck, 0.05)
+    assert len(started) == 2
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while abandoned_calls() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert run_with_timeout(lambda: "ok", 1.0) == "ok"
+
+
+def test_page_images_share_the_page_qr_deadline(monkeypatch):
+    import fitz
+
+    from src import main
+
+    doc = fitz.open()
+    page = doc.new_page()
+    for i in range(4):
+        pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 200, 200), False)
+        pix.set_rect(pix.irect, (i * 60, 0, 0))
+        page.insert_image(fitz.Rect(0, i * 100, 100, i * 100 + 100), pixmap=pix)
+
+    calls = []
+
+    def slow_decode(pixmap):
+        calls.append(1)
+        time.sleep(0.15)
+        return []
+
+    monkeypatch.setattr(main, "decode_qr_from_pixmap", slow_decode)
+    page_budget = main.TimeBudget(page_seconds={"qr": 0.4})
+    started = time.monotonic()
+    main._qr_from_page(doc, page, 1, page_budget)
+
+    assert time.monotonic() - started < 0.6
+    assert len(calls) < 5
+    assert [d["action"] for d in page_budget.degraded] == ["skip_qr"]
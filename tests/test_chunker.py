@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from src.pipeline.chunker import ChunkStream, chunk_text
+
+
+def _random_text(rng: random.Random, max_chars: int) -> str:
+    lines = []
+    for _ in range(rng.randint(0, 40)):
+        kind = rng.random()
+        if kind < 0.2:
+            length = 0
+        elif kind < 0.3:
+            length = rng.randint(max_chars, max_chars * 3)  # longer than a whole chunk
+        else:
+            length = rng.randint(1, max(1, max_chars // 2))
+        lines.append("".join(rng.choice("ab ₹.") for _ in range(length)))
+    return "\n".join(lines) + rng.choice(["", "\n", "\n\n"])
+
+
+def _random_pieces(rng: random.Random, text: str) -> list[str]:
+    cuts = sorted(rng.randint(0, len(text)) for _ in range(rng.randint(0, 12)))
+    return [text[start:end] for start, end in zip([0, *cuts], [*cuts, len(text)])]
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_stream_matches_chunk_text_for_any_split(seed):
+    rng = random.Random(seed)
+    max_chars = rng.choice([1, 5, 20, 80])
+    text = _random_text(rng, max_chars)
+
+    stream = ChunkStream(max_chars)
+    chunks = []
+    for piece in _random_pieces(rng, text):
+        chunks.extend(stream.feed(piece))
+    chunks.extend(stream.flush())
+
+    assert chunks == chunk_text(text, max_chars)
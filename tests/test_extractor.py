@@ -0,0 +1,30 @@
+import fitz
+
+from src.pipeline import extractor
+from src.pipeline.extractor import PARALLEL_MIN_PAGES, extract_pages, extract_text
+
+
+def _make_pdf(path, pages: int):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        if i % 7 == 3:
+            continue  # leave some pages empty
+        page.insert_text((72, 72), f"Page {i + 1}: Round {i % 9 + 1} at 10:{i % 60:02d} am")
+        page.insert_text((72, 100), f"Entry fee {100 + i} | Venue hall {i}")
+    doc.save(str(path))
+    doc.close()
+
+
+def test_parallel_extraction_matches_serial(tmp_path, monkeypatch):
+    pdf = tmp_path / "large.pdf"
+    _make_pdf(pdf, PARALLEL_MIN_PAGES + 5)
+    monkeypatch.setattr(extractor, "EXTRACT_WORKERS", 3)
+
+    for include_empty in (False, True):
+        serial = extract_text(str(pdf), include_empty=include_empty)
+        assert extract_text(str(pdf), include_empty=include_empty, parallel=True) == serial
+
+    serial_pages = extract_pages(str(pdf), workers=1)
+    assert extract_pages(str(pdf), workers=2, min_pages=1) == serial_pages
+    assert [p["page"] for p in serial_pages] == list(range(1, PARALLEL_MIN_PAGES + 6))
@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from scripts.mock_gemini_server import MockConfig, start_mock_server
+from src.llm import gemini
+from src.llm.gemini import AsyncGeminiClient, TokenBucket
+
+
+@pytest.fixture
+def mock_gemini():
+    """Start the Gemini mock with the given config; yields a factory returning (state, base_url)."""
+    servers = []
+
+    def start(**config):
+        server, state, base_url = start_mock_server(MockConfig(**config))
+        servers.append(server)
+        return state, base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _client(base_url, **kwargs):
+    kwargs.setdefault("requests_per_minute", 0)
+    kwargs.setdefault("tokens_per_minute", 0)
+    return AsyncGeminiClient(api_key="test", base_url=base_url, **kwargs)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_token_bucket_paces_once_the_burst_is_spent():
+    async def run():
+        bucket = TokenBucket(60)  # one unit per second
+        started = time.monotonic()
+        await bucket.acquire(60)
+        burst = time.monotonic() - started
+        await bucket.acquire(0.5)
+        return burst, time.monotonic() - started
+
+    burst, total = _run(run())
+    assert burst < 0.1
+    assert 0.4 <= total < 0.9
+
+
+def test_deadline_covers_the_whole_call(mock_gemini):
+    _, base_url = mock_gemini(latency="fixed", latency_ms=500)
+
+    async def run():
+        client = _client(base_url)
+        try:
+            started = time.monotonic()
+            with pytest.raises(asyncio.TimeoutError):
+                await client.generate("prompt", deadline=0.2)
+            return time.monotonic() - started, client.stats
+        finally:
+            client.close()
+
+    elapsed, stats = _run(run())
+    assert elapsed < 0.45
+    assert stats["failures"] == 1
+
+
+def test_retries_429_and_5xx_honouring_retry_after(mock_gemini, monkeypatch):
+    monkeypatch.setattr(gemini, "RETRY_BACKOFF_SECONDS", 0.01)
+    state, base_url = mock_gemini(latency="fixed", latency_ms=0, retry_after=0.3)
+    statuses = iter([429, 503, 200])
+    state.outcome = lambda: next(statuses)
+
+    async def run():
+        client = _client(base_url)
+        try:
+            started = time.monotonic()
+            data = await client.generate("prompt", deadline=5)
+            return data, time.monotonic() - started, client.stats
+        finally:
+            client.close()
+
+    data, elapsed, stats = _run(run())
+    assert gemini.parse_response(data)["tournamentName"]
+    assert elapsed >= 0.3
+    assert stats == {"requests": 3, "retries": 2, "rate_limited": 1, "failures": 0}
+
+
+def test_retries_connection_errors(mock_gemini, monkeypatch):
+    monkeypatch.setattr(gemini, "RETRY_BACKOFF_SECONDS", 0.01)
+    _, base_url = mock_gemini(latency="fixed", latency_ms=0)
+    real_post = requests.post
+    failures = iter([requests.ConnectionError("reset"), requests.Timeout("slow")])
+
+    def flaky_post(*args, **kwargs):
+        error = next(failures, None)
+        if error:
+            raise error
+        return real_post(*args, **kwargs)
+
+    monkeypatch.setattr(gemini.requests, "post", flaky_post)
+
+    async def run():
+        client = _client(base_url)
+        try:
+            await client.generate("prompt", deadline=5)
+            return client.stats
+        finally:
+            client.close()
+
+    stats = _run(run())
+    assert stats["requests"] == 3 and stats["retries"] == 2
+
+
+def test_slot_is_released_when_a_timed_out_call_returns(mock_gemini):
+    _, base_url = mock_gemini(latency="fixed", latency_ms=300)
+
+    async def run():
+        client = _client(base_url, max_concurrency=1)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.generate("prompt", deadline=0.1)
+            # The abandoned HTTP call still holds the only slot...
+            held = client._semaphore.locked()
+            # ...until it returns, after which the next call gets through.
+            data = await client.generate("prompt", deadline=3)
+            return held, data
+        finally:
+            client.close()
+
+    held, data = _run(run())
+    assert held
+    assert gemini.parse_response(data)["tournamentName"]
@@ -0,0 +1,65 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.pipeline.images import image_page_count, iter_image_pages
+
+
+def _rgba(h, w):
+    img = np.zeros((h, w, 4), np.uint8)
+    img[:, : w // 2] = (0, 0, 255, 255)  # opaque red left half, transparent black right half
+    return img
+
+
+def test_tiff_frames_are_streamed_with_alpha_on_white(tmp_path):
+    path = tmp_path / "brochure.tif"
+    assert cv2.imwritemulti(str(path), [_rgba(50, 60), _rgba(40, 40)])
+
+    frames = iter_image_pages(str(path))
+    index, first = next(frames)
+    assert index == 0
+    assert first.shape == (50, 60, 3)
+    assert first[0, 0].tolist() == [0, 0, 255]
+    assert first[0, -1].tolist() == [255, 255, 255]
+    index, second = next(frames)
+    assert (index, second.shape) == (1, (40, 40, 3))
+    assert next(frames, None) is None
+    assert image_page_count(str(path)) == 2
+
+
+def test_png_alpha_and_grayscale_become_bgr(tmp_path):
+    png = tmp_path / "logo.png"
+    cv2.imwrite(str(png), _rgba(20, 20))
+    ((_, page),) = iter_image_pages(str(png))
+    assert page[0, -1].tolist() == [255, 255, 255]
+
+    gray = tmp_path / "scan.png"
+    cv2.imwrite(str(gray), np.full((10, 10), 40000, np.uint16))
+    ((_, page),) = iter_image_pages(str(gray))
+    assert page.shape == (10, 10, 3) and page.dtype == np.uint8
+
+
+def test_undecodable_image_raises(tmp_path):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32)
+    with pytest.raises(ValueError):
+        list(iter_image_pages(str(path)))
+
+
+def test_pages_keep_frame_numbers_when_a_frame_fails(tmp_path, monkeypatch):
+    from src.main import iter_image
+    from src.pipeline import images
+
+    path = tmp_path / "brochure.tif"
+    assert cv2.imwritemulti(str(path), [_rgba(50, 60), _rgba(50, 60), _rgba(50, 60)])
+    imreadmulti = cv2.imreadmulti
+
+    def second_frame_broken(filename, start, count, flags):
+        if start == 1:
+            return False, ()
+        return imreadmulti(filename, start, count, flags=flags)
+
+    monkeypatch.setattr(images.cv2, "imreadmulti", second_frame_broken)
+    assert [index for index, _ in iter_image_pages(str(path))] == [0, 2]
+    pages = [event["page"] for event in iter_image(str(path), ocr_profile="fast") if event["type"] == "page"]
+    assert pages == [1, 3]
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+
+from src.pipeline import ocr
+from src.pipeline.ocr import OcrCache
+
+LINES = [{"text": "1st Prize Rs. 5000", "confidence": 0.9, "box": [[0, 0], [1, 0], [1, 1], [0, 1]]}]
+
+
+class FakeEngine:
+    name = "fake"
+
+    def recognize(self, img, use_angle_cls, settings):
+        return LINES
+
+
+def test_eviction_skips_entries_deleted_by_another_process(tmp_path):
+    cache = OcrCache(str(tmp_path), max_entries=3)
+    for i in range(3):
+        cache.put(f"{i:064x}", LINES)
+    gone = tmp_path / "aa" / f"{'a' * 64}.json"
+    list_entries = cache._entries
+    # Another worker evicts this entry between our glob and our stat.
+    cache._entries = lambda: list_entries() + [gone]
+    cache.put(f"{3:064x}", LINES)
+
+
+def test_failed_cache_write_keeps_the_ocr_result(tmp_path, monkeypatch):
+    not_a_dir = tmp_path / "cache"
+    not_a_dir.write_text("")
+    monkeypatch.setattr(ocr, "_OCR_CACHE", OcrCache(str(not_a_dir)))
+    monkeypatch.setattr(ocr, "get_engine", lambda name=None: FakeEngine())
+
+    img = np.full((40, 40, 3), 255, np.uint8)
+    assert ocr.ocr_image_lines(img, use_angle_cls=False) == LINES
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    cache = OcrCache(str(tmp_path), max_entries=10)
+    keys = [f"{i:064x}" for i in range(10)]
+    for i, key in enumerate(keys):
+        cache.put(key, LINES)
+        path = cache._path(key)
+        os.utime(path, (1000 + i, 1000 + i))
+    assert cache.get(keys[0]) == LINES  # touch the oldest entry
+
+    cache.put(f"{10:064x}", LINES)
+
+    remaining = {p.stem for p in tmp_path.glob("*/*.json")}
+    assert len(remaining) == 9
+    assert keys[0] in remaining
+    assert keys[1] not in remaining and keys[2] not in remaining
+
+
+def test_hit_and_miss_counters(tmp_path):
+    cache = OcrCache(str(tmp_path), max_entries=10)
+    key = f"{1:064x}"
+    assert cache.get(key) is None
+    cache.put(key, LINES)
+    assert cache.get(key) == LINES
+    assert cache.get(key) == LINES
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 0.667}
+
+
+def test_key_depends_on_pixels_and_settings():
+    img = np.zeros((30, 30, 3), np.uint8)
+    settings = {"engine": "paddle", "use_angle_cls": False, "engine_settings": {"drop_score": 0.5}}
+    key = OcrCache.make_key(img, settings)
+
+    assert OcrCache.make_key(img.copy(), dict(settings)) == key
+    assert OcrCache.make_key(img, {**settings, "use_angle_cls": True}) != key
+    assert OcrCache.make_key(img, {**settings, "engine_settings": {"drop_score": 0.6}}) != key
+    other = img.copy()
+    other[0, 0] = 1
+    assert OcrCache.make_key(other, settings) != key
+    assert OcrCache.make_key(img.reshape(15, 60, 3), settings) != key
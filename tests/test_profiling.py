@@ -0,0 +1,40 @@
+import tracemalloc
+
+from src.pipeline.budget import run_with_timeout
+from src.profiling import profile_stage, profiled, start_profiling, stop_profiling
+
+
+def _decode_stand_in(n):
+    return sum(i * i for i in range(n))
+
+
+def test_work_on_timeout_thread_is_credited_to_the_stage():
+    expected = _decode_stand_in(10000)
+    profiler = start_profiling()
+    try:
+        with profile_stage("qr"):
+            value = run_with_timeout(profiled(_decode_stand_in), 30, 10000)
+        with profile_stage("ocr"):
+            # Same thread as the stage: no second profiler, still counted.
+            profiled(_decode_stand_in)(10)
+    finally:
+        stop_profiling()
+
+    assert value == expected
+    qr, ocr = profiler.report().split("=== ocr ===")
+    assert "_decode_stand_in" in qr
+    assert "_decode_stand_in" in ocr
+
+
+def test_stop_leaves_tracing_started_elsewhere_running():
+    tracemalloc.start()
+    try:
+        start_profiling()
+        stop_profiling()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    start_profiling()
+    stop_profiling()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,76 @@
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+from src.sink import BatchHttpSink, FileSink
+
+
+class FlakyFileSink(FileSink):
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self.fail = True
+
+    def _write_batch(self, items):
+        if self.fail:
+            raise OSError("disk unavailable")
+        super()._write_batch(items)
+
+
+def test_failed_count_flush_keeps_items_buffered(tmp_path):
+    sink = FlakyFileSink(tmp_path / "out.jsonl.gz", max_items=2, max_wait=0)
+    sink.add("a", {"n": 1})
+    sink.add("b", {"n": 2})  # triggers the failing flush but must not raise
+    assert sink.pending() == 2
+
+    with pytest.raises(OSError):
+        sink.flush()
+    assert sink.pending() == 2
+
+    sink.fail = False
+    sink.close()
+    assert sink.pending() == 0
+    with gzip.open(tmp_path / "out.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["eventId"] for line in f] == ["a", "b"]
+
+
+class SlowFileSink(FileSink):
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self.uploading = threading.Event()
+        self.release = threading.Event()
+
+    def _write_batch(self, items):
+        self.uploading.set()
+        self.release.wait(5)
+        super()._write_batch(items)
+
+
+def test_slow_upload_does_not_block_add(tmp_path):
+    sink = SlowFileSink(tmp_path / "out.jsonl.gz", max_items=2, max_wait=0)
+    sink.add("a", {"n": 1})
+    flusher = threading.Thread(target=sink.flush)
+    flusher.start()
+    assert sink.uploading.wait(5)
+
+    started = time.monotonic()
+    sink.add("b", {"n": 2})
+    sink.add("c", {"n": 3})  # count-triggered while the upload is still running
+    assert time.monotonic() - started < 0.5
+    assert sink.pending() == 2
+
+    sink.release.set()
+    flusher.join(5)
+    sink.close()
+    with gzip.open(tmp_path / "out.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["eventId"] for line in f] == ["a", "b", "c"]
+
+
+def test_idempotency_key_changes_with_analysis():
+    first = BatchHttpSink._idempotency_key([{"eventId": "e1", "Analysis": {"v": 1}}, {"eventId": "e2", "Analysis": None}])
+    replay = BatchHttpSink._idempotency_key([{"eventId": "e2", "Analysis": None}, {"eventId": "e1", "Analysis": {"v": 1}}])
+    rerun = BatchHttpSink._idempotency_key([{"eventId": "e1", "Analysis": {"v": 2}}, {"eventId": "e2", "Analysis": None}])
+    assert first == replay
+    assert first != rerun
@@ -0,0 +1,36 @@
+import asyncio
+from argparse import Namespace
+
+from scripts.process_events import _sync_events, iter_event_pages
+from src.sink import PostSink, ResultSink
+
+
+def test_sync_sees_every_event_while_writing_analyses(stub_api):
+    state, base_url = stub_api
+    sink = PostSink(base_url)
+    processed = []
+    for page in iter_event_pages(base_url, updated_since="2025-06-01T05:00:00.000000Z", page_size=7):
+        for event in page:
+            if event["Analysis"] is None:
+                sink.add(event["eventId"], {"tournamentName": event["name"]})
+                processed.append(event["eventId"])
+
+    # Events 0-4 predate the watermark; every later one is processed exactly once.
+    assert processed == [f"evt{i:05d}" for i in range(5, 30)]
+    assert all(state.events[event_id]["Analysis"] for event_id in processed)
+
+
+class UnflushableSink(ResultSink):
+    def add(self, event_id, analysis):
+        pass
+
+    def flush(self):
+        raise OSError("upload failed")
+
+
+def test_watermark_not_saved_when_flush_fails(stub_api, tmp_path):
+    _, base_url = stub_api
+    state_path = tmp_path / "sync.json"
+    args = Namespace(base_url=base_url, sync_state=str(state_path), page_size=10, ocr_profile="fast")
+    asyncio.run(_sync_events(args, UnflushableSink(), None, tmp_path, tmp_path, tmp_path))
+    assert not state_path.exists()
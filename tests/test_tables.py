@@ -0,0 +1,68 @@
+from src.llm.parser import _prepare_content
+from src.pipeline.tables import detect_tables, format_tables
+
+WORD_HEIGHT = 10
+CHAR_WIDTH = 5
+
+
+def _words(rows):
+    """Word boxes for rows of (y, [(x, cell text), ...]); cell words are spaced normally."""
+    words = []
+    for y, cells in rows:
+        for x, text in cells:
+            for word in text.split():
+                width = len(word) * CHAR_WIDTH
+                words.append((x, y, x + width, y + WORD_HEIGHT, word))
+                x += width + CHAR_WIDTH
+    return words
+
+
+def test_two_column_prose_is_not_a_table():
+    words = _words([
+        (100, [(50, "Entry fee must be paid before the closing date"), (400, "Players must report at the venue by 9:30")]),
+        (115, [(50, "Late entries are accepted only with approval"), (400, "Rounds start sharp and the schedule is final")]),
+        (130, [(50, "Players should carry their FIDE ID card"), (400, "Mobile phones are not allowed in the hall")]),
+        (145, [(50, "Decisions of the arbiter will be final"), (400, "Tie breaks will be announced before round 1")]),
+    ])
+    assert detect_tables(words, 1) == []
+
+
+def test_prize_table_after_a_gap_keeps_its_title():
+    words = _words([
+        (100, [(50, "Entry"), (200, "Fee")]),
+        (115, [(50, "Open"), (200, "500")]),
+        (130, [(50, "Under 15"), (200, "300")]),
+        (200, [(50, "PRIZE FUND")]),
+        (215, [(50, "Rank"), (200, "Amount")]),
+        (230, [(50, "1st"), (200, "Rs. 5000")]),
+        (245, [(50, "2nd"), (200, "Rs. 3000")]),
+    ])
+    tables = detect_tables(words, 2)
+    assert [(t["kind"], t["title"]) for t in tables] == [("entry_fee", None), ("prize", "PRIZE FUND")]
+    assert tables[1]["rows"][1:] == [["1st", "Rs. 5000"], ["2nd", "Rs. 3000"]]
+
+
+def test_prize_normalization_kept_unless_prize_table_rebuilt():
+    text = "PRIZES\n1st Rs. 5000\n2nd Rs. 3000\n\n"
+    schedule = format_tables([{"page": 1, "kind": "schedule", "title": None, "rows": [["Round 1", "10:00 AM"]]}])
+    prize = format_tables([{"page": 1, "kind": "prize", "title": None, "rows": [["1st", "Rs. 5000"]]}])
+
+    prepared = _prepare_content(text + schedule)
+    assert "=== NORMALIZED PRIZES ===" in prepared
+    assert prepared.endswith(schedule.lstrip("\n"))
+
+    # The rebuilt prize table stands in for both the raw row and the regex copies.
+    assert _prepare_content(text + prize) == "PRIZES\n2nd Rs. 3000" + prize
+
+
+def test_rebuilt_table_rows_replace_their_raw_lines():
+    rows = [["Rank", "Amount", "Trophy"], ["1st", "Rs. 5000", "Yes"], ["2nd", "Rs. 3000", "No"]]
+    raw = "\n".join(cell for row in rows for cell in row)
+    text = f"PRIZE FUND\n{raw}\nVenue: Community Hall\n1st floor\nYes we have parking\n"
+    section = format_tables([{"page": 1, "kind": "prize", "title": "PRIZE FUND", "rows": rows}])
+
+    prepared = _prepare_content(text + section)
+    body, tables = prepared.split("=== TABLES ===")
+    assert body.split("\n") == ["PRIZE FUND", "Venue: Community Hall", "1st floor", "Yes we have parking", "", ""]
+    assert tables.count("Rs. 5000") == 1
+    assert "Rs. 5000" not in body